@@ -13,7 +13,10 @@ Then view traces:
     traceboard ui
 """
 
+import ast
 import asyncio
+import operator
+from functools import lru_cache
 
 import traceboard
 traceboard.init()
@@ -33,12 +36,42 @@ def get_weather(city: str) -> str:
     return weather_data.get(city.lower(), f"Weather data not available for {city}")
 
 
+_BINARY_OPS = {
+    ast.Add: operator.add,
+    ast.Sub: operator.sub,
+    ast.Mult: operator.mul,
+    ast.Div: operator.truediv,
+    ast.FloorDiv: operator.floordiv,
+    ast.Mod: operator.mod,
+    ast.Pow: operator.pow,
+}
+_UNARY_OPS = {ast.UAdd: operator.pos, ast.USub: operator.neg}
+
+
+@lru_cache(maxsize=256)
+def _parse(expression: str) -> ast.expr:
+    return ast.parse(expression, mode="eval").body
+
+
+def _evaluate(node: ast.expr) -> int | float:
+    """Evaluate an arithmetic-only AST (numbers and + - * / // % **)."""
+    if isinstance(node, ast.Constant) and type(node.value) in (int, float):
+        return node.value
+    if isinstance(node, ast.BinOp) and type(node.op) in _BINARY_OPS:
+        left, right = _evaluate(node.left), _evaluate(node.right)
+        if isinstance(node.op, ast.Pow) and abs(right) > 1000:
+            raise ValueError("exponent too large")
+        return _BINARY_OPS[type(node.op)](left, right)
+    if isinstance(node, ast.UnaryOp) and type(node.op) in _UNARY_OPS:
+        return _UNARY_OPS[type(node.op)](_evaluate(node.operand))
+    raise ValueError(f"unsupported expression: {ast.dump(node)}")
+
+
 @function_tool
 def calculate(expression: str) -> str:
     """Evaluate a mathematical expression."""
     try:
-        result = eval(expression, {"__builtins__": {}})
-        return str(result)
+        return str(_evaluate(_parse(expression)))
     except Exception as e:
         return f"Error: {e}"
 
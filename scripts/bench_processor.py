@@ -0,0 +1,126 @@
+"""
+Benchmark TraceBoardProcessor span throughput
+=============================================
+
+Feeds synthetic Agents SDK traces through ``TraceBoardProcessor`` and
+reports spans/sec, time spent waiting for the writer thread, and peak RSS.
+
+Usage:
+    python scripts/bench_processor.py --traces 100 --spans 1000
+
+Profile CPU or allocations by running it under an external profiler:
+    py-spy record -o flame.svg -- python scripts/bench_processor.py
+    memray run -o bench.bin scripts/bench_processor.py && memray flamegraph bench.bin
+"""
+
+from __future__ import annotations
+
+import argparse
+import os
+import sys
+import tempfile
+import threading
+import time
+
+from agents.tracing.span_data import FunctionSpanData, GenerationSpanData
+
+from traceboard.config import TraceboardConfig
+from traceboard.sdk.processor import TraceBoardProcessor
+
+
+class FakeTrace:
+    """The attributes TraceBoardProcessor reads from an Agents SDK Trace."""
+
+    def __init__(self, trace_id: str):
+        self.trace_id = trace_id
+        self.name = "Benchmark workflow"
+        self.group_id = None
+        self.metadata = {"bench": True}
+
+
+class FakeSpan:
+    """The attributes TraceBoardProcessor reads from an Agents SDK Span."""
+
+    def __init__(self, span_id: str, trace_id: str, span_data: object):
+        self.span_id = span_id
+        self.trace_id = trace_id
+        self.parent_id = None
+        self.span_data = span_data
+        self.name = None
+        self.error = None
+
+
+def make_span_data(i: int, payload: str) -> object:
+    """Alternate generation and function spans with ``payload``-sized bodies."""
+    if i % 2:
+        return FunctionSpanData(name="lookup", input=payload, output=payload)
+    return GenerationSpanData(
+        input=[{"role": "user", "content": payload}],
+        output=[{"role": "assistant", "content": payload}],
+        model="gpt-4o-mini",
+        usage={"input_tokens": 100, "output_tokens": 50},
+    )
+
+
+def run_traces(processor: TraceBoardProcessor, worker: int, traces: int, spans: int, payload: str) -> None:
+    for t in range(traces):
+        trace = FakeTrace(f"trace_{worker}_{t}")
+        processor.on_trace_start(trace)
+        for s in range(spans):
+            span = FakeSpan(f"span_{worker}_{t}_{s}", trace.trace_id, make_span_data(s, payload))
+            processor.on_span_start(span)
+            processor.on_span_end(span)
+        processor.on_trace_end(trace)
+
+
+def peak_rss_mb() -> float | None:
+    """Peak resident set size of this process, where the platform reports it."""
+    try:
+        import resource
+    except ImportError:  # Windows
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # Linux reports KiB, macOS bytes
+    return peak / (1 << 20) if sys.platform == "darwin" else peak / 1024
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--traces", type=int, default=100, help="traces per thread")
+    parser.add_argument("--spans", type=int, default=1000, help="spans per trace")
+    parser.add_argument("--payload-size", type=int, default=500, help="characters per input/output")
+    parser.add_argument("--threads", type=int, default=1, help="threads emitting traces concurrently")
+    parser.add_argument("--db", help="database path (default: a temporary file)")
+    args = parser.parse_args()
+
+    db_path = args.db or os.path.join(tempfile.mkdtemp(), "bench.db")
+    processor = TraceBoardProcessor(TraceboardConfig(db_path=db_path))
+    payload = "x" * args.payload_size
+
+    workers = [
+        threading.Thread(target=run_traces, args=(processor, w, args.traces, args.spans, payload))
+        for w in range(args.threads)
+    ]
+    start = time.perf_counter()
+    for worker in workers:
+        worker.start()
+    for worker in workers:
+        worker.join()
+    emitted = time.perf_counter()
+    processor.force_flush()
+    flushed = time.perf_counter()
+    processor.shutdown()
+
+    total = args.threads * args.traces * args.spans
+    print(f"spans:          {total:,}")
+    print(f"callbacks:      {emitted - start:.2f}s  ({total / (emitted - start):,.0f} spans/s)")
+    print(f"writer drain:   {flushed - emitted:.2f}s after callbacks returned")
+    print(f"end to end:     {total / (flushed - start):,.0f} spans/s")
+    rss = peak_rss_mb()
+    if rss is not None:
+        print(f"peak RSS:       {rss:,.0f} MiB")
+    print(f"database:       {db_path} ({os.path.getsize(db_path) / (1 << 20):,.1f} MiB)")
+
+
+if __name__ == "__main__":
+    main()
@@ -1,5 +1,6 @@
 """Tests for FastAPI API routes."""
 
+import asyncio
 import os
 import tempfile
 
@@ -9,6 +10,7 @@ from httpx import ASGITransport, AsyncClient
 
 from traceboard.server.app import create_app
 from traceboard.server.database import Database
+from traceboard.server.routes.metrics import manager, push_updates
 from traceboard.server.models import SpanRecord, SpanType, TraceRecord, TraceStatus
 
 
@@ -116,3 +118,110 @@ async def test_delete_all(client: AsyncClient):
     assert resp.status_code == 200
     data = resp.json()
     assert data["deleted"] == 1
+
+
+@pytest.mark.asyncio
+async def test_export_streams_full_document(client: AsyncClient):
+    """Test that the streamed export matches Database.export_all."""
+    from traceboard import _json
+
+    db = client._transport.app.state.db
+    for i in range(3):
+        await db.insert_trace(TraceRecord(trace_id=f"t{i}", started_at=1000.0 + i))
+        await db.insert_span(
+            SpanRecord(span_id=f"s{i}", trace_id=f"t{i}", started_at=1000.0 + i, span_data={"i": i})
+        )
+
+    resp = await client.get("/api/export")
+    assert resp.status_code == 200
+    data = resp.json()
+    assert data == _json.loads(_json.dumpb(await db.export_all()))
+    assert [item["trace"]["trace_id"] for item in data["traces"]] == ["t2", "t1", "t0"]
+    assert data["traces"][0]["spans"][0]["span_data"] == {"i": 2}
+
+
+@pytest.mark.asyncio
+async def test_export_trace_matches_models(client: AsyncClient):
+    """Test that the single-trace export has the models' wire shape."""
+    db = client._transport.app.state.db
+    await db.insert_trace(TraceRecord(trace_id="t_exp", started_at=1000.0, metadata={"k": 1}))
+    await db.insert_span(
+        SpanRecord(span_id="s_exp", trace_id="t_exp", started_at=1000.0, error={"message": "x"})
+    )
+    # Large enough to be stored compressed
+    await db.insert_span(
+        SpanRecord(span_id="s_big", trace_id="t_exp", started_at=1001.0, span_data={"text": "x" * 5000})
+    )
+
+    resp = await client.get("/api/traces/t_exp/export")
+    assert resp.status_code == 200
+    trace = await db.get_trace("t_exp")
+    spans = await db.get_spans_for_trace("t_exp")
+    assert resp.json() == {
+        "trace": trace.model_dump(mode="json"),
+        "spans": [s.model_dump(mode="json") for s in spans],
+    }
+
+    resp = await client.get("/api/traces/missing/export")
+    assert resp.status_code == 404
+
+
+@pytest.mark.asyncio
+async def test_live_updates_poll_once_for_all_clients(client: AsyncClient):
+    """A single poller broadcasts each database change to every client."""
+    from traceboard import _json
+    from traceboard.server.database import SyncDatabase
+
+    db = client._transport.app.state.db
+    await db.insert_trace(TraceRecord(trace_id="t_live", started_at=1000.0))
+
+    class FakeSocket:
+        def __init__(self):
+            self.sent: list[str] = []
+
+        async def send_text(self, text: str):
+            self.sent.append(text)
+
+    class DeadSocket:
+        async def send_text(self, text: str):
+            raise RuntimeError("closed")
+
+    sockets = [FakeSocket(), FakeSocket()]
+    dead = DeadSocket()
+    manager.active_connections.update([*sockets, dead])
+    manager.needs_snapshot = True
+    calls = 0
+    get_metrics = db.get_metrics
+
+    async def counting_get_metrics():
+        nonlocal calls
+        calls += 1
+        return await get_metrics()
+
+    db.get_metrics = counting_get_metrics
+    task = asyncio.create_task(push_updates(db, interval=0.01, debounce=0))
+    try:
+        await asyncio.sleep(0.1)
+        # Idle ticks don't query metrics
+        assert calls == 1
+
+        # A commit from another connection, as an SDK process would make
+        sync_db = SyncDatabase(db.db_path)
+        sync_db.connect()
+        try:
+            sync_db.insert_trace(TraceRecord(trace_id="t_sdk", started_at=1001.0))
+        finally:
+            sync_db.close()
+        await asyncio.sleep(0.1)
+    finally:
+        task.cancel()
+        for ws in sockets:
+            manager.disconnect(ws)
+
+    assert calls == 2
+    assert dead not in manager.active_connections
+    for ws in sockets:
+        assert len(ws.sent) == 2
+        messages = [_json.loads(text) for text in ws.sent]
+        assert [m["type"] for m in messages] == ["update", "update"]
+        assert [m["metrics"]["total_traces"] for m in messages] == [1, 2]
@@ -0,0 +1,61 @@
+"""Tests for BaseTracer, the shared base of the SDK adapters."""
+
+from traceboard import _json
+from traceboard.config import TraceboardConfig
+from traceboard.sdk._base import BaseTracer
+from traceboard.server.database import SyncDatabase
+
+
+def test_disabled_tracer_skips_database(tmp_path):
+    """Test that a disabled BaseTracer records nothing and creates no DB."""
+    db_path = tmp_path / "disabled.db"
+    tracer = BaseTracer(TraceboardConfig(db_path=str(db_path), enabled=False))
+
+    trace_id, span_id = tracer.record_llm_start(model="gpt-4o")
+    tracer.record_llm_end(trace_id=trace_id, span_id=span_id, model="gpt-4o")
+    tracer.record_tool_call(trace_id=trace_id, tool_name="search")
+    tracer.flush()
+    tracer.shutdown()
+
+    assert trace_id and span_id
+    assert not db_path.exists()
+
+
+def test_pending_calls_are_capped(tmp_path):
+    """Test that tracked in-flight calls are capped, dropping the oldest."""
+    tracer = BaseTracer(
+        TraceboardConfig(db_path=str(tmp_path / "t.db"), enabled=False, max_pending_runs=2)
+    )
+    pending: dict[str, int] = {}
+    for i in range(4):
+        tracer._track_pending(pending, f"call{i}", i)
+    assert pending == {"call2": 2, "call3": 3}
+
+
+def test_recorded_dicts_are_snapshotted(tmp_path):
+    """Test that caller dicts mutated after recording don't change what's stored."""
+    db_path = str(tmp_path / "t.db")
+    tracer = BaseTracer(TraceboardConfig(db_path=db_path))
+    metadata = {"tags": ["a"]}
+    error = {"message": "boom"}
+    extra = {"messages": [{"role": "user"}]}
+
+    trace_id, span_id = tracer.record_llm_start(model="gpt-4o", metadata=metadata)
+    tracer.record_llm_end(
+        trace_id=trace_id, span_id=span_id, error=error, extra_data=extra
+    )
+    metadata["tags"].append("b")
+    error["message"] = "changed"
+    extra["messages"][0]["role"] = "changed"
+    tracer.shutdown()
+
+    db = SyncDatabase(db_path)
+    db.connect()
+    try:
+        (trace_meta,) = db.conn.execute("SELECT metadata FROM traces").fetchone()
+        span_data, span_error = db.conn.execute("SELECT span_data, error FROM spans").fetchone()
+    finally:
+        db.close()
+    assert _json.unpack(trace_meta) == {"tags": ["a"]}
+    assert _json.unpack(span_error) == {"message": "boom"}
+    assert _json.unpack(span_data)["messages"] == [{"role": "user"}]
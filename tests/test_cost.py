@@ -0,0 +1,34 @@
+"""Tests for model pricing and cost calculation."""
+
+from traceboard.cost import DEFAULT_PRICE, calculate_cost, get_model_price
+
+
+def test_exact_model_price():
+    """Test that listed models use their own price."""
+    assert get_model_price("gpt-4o") == (2.50, 10.00)
+    assert calculate_cost("gpt-4o", 1_000_000, 1_000_000) == 12.5
+
+
+def test_dated_variant_uses_family_price():
+    """Test that unlisted dated/tagged variants resolve to the longest known prefix."""
+    assert get_model_price("gpt-4o-2026-03-01") == get_model_price("gpt-4o")
+    assert get_model_price("gpt-4o-mini-2026-03-01") == get_model_price("gpt-4o-mini")
+    assert get_model_price("o3-2025-04-16") == get_model_price("o3")
+
+
+def test_provider_prefix_stripped():
+    """Test that LiteLLM-style provider/model names resolve."""
+    assert get_model_price("openai/gpt-4.1-mini") == get_model_price("gpt-4.1-mini")
+
+
+def test_unknown_model_uses_default():
+    """Test that prefixes only match on a name boundary."""
+    assert get_model_price("gpt-40") == DEFAULT_PRICE
+    assert get_model_price("totally-unknown") == DEFAULT_PRICE
+
+
+def test_cost_rounded_to_eight_decimals():
+    """Test that sub-cent costs keep 8-decimal precision."""
+    assert calculate_cost("gemini-1.5-flash-8b", 1, 0) == 0.00000004
+    assert calculate_cost("gpt-4o", 1234, 567) == 0.008755
+    assert calculate_cost("gpt-4o") == 0.0
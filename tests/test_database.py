@@ -6,7 +6,7 @@ import tempfile
 import pytest
 import pytest_asyncio
 
-from traceboard.server.database import Database
+from traceboard.server.database import Database, SyncDatabase
 from traceboard.server.models import SpanRecord, SpanType, TraceRecord, TraceStatus
 
 
@@ -63,6 +63,46 @@ async def test_list_traces_pagination(db: Database):
     assert len(items2) == 3
 
 
+@pytest.mark.asyncio
+async def test_list_traces_keyset(db: Database):
+    """Test cursor-based listing matches offset pages."""
+    for i in range(10):
+        await db.insert_trace(
+            TraceRecord(
+                trace_id=f"trace_{i:03d}",
+                started_at=1000.0 + i,
+                status=TraceStatus.COMPLETED,
+            )
+        )
+    await db.insert_span(
+        SpanRecord(span_id="s1", trace_id="trace_006", started_at=1006.5)
+    )
+
+    first, total = await db.list_traces(page_size=3)
+    second, _ = await db.list_traces(page_size=3, after=first[-1].started_at)
+    by_offset, _ = await db.list_traces(page=2, page_size=3)
+
+    assert total == 10
+    assert [t.trace_id for t in second] == ["trace_006", "trace_005", "trace_004"]
+    assert [t.trace_id for t in second] == [t.trace_id for t in by_offset]
+    assert second[0].span_count == 1
+    assert second[1].span_count == 0
+
+
+@pytest.mark.asyncio
+async def test_list_traces_keyset_ties(db: Database):
+    """Test that after_id keeps traces sharing a start time on later pages."""
+    for i in range(4):
+        await db.insert_trace(TraceRecord(trace_id=f"trace_{i}", started_at=1000.0))
+
+    first, _ = await db.list_traces(page_size=2)
+    second, _ = await db.list_traces(
+        page_size=2, after=first[-1].started_at, after_id=first[-1].trace_id
+    )
+
+    assert [t.trace_id for t in first + second] == ["trace_3", "trace_2", "trace_1", "trace_0"]
+
+
 @pytest.mark.asyncio
 async def test_list_traces_filter_status(db: Database):
     """Test filtering traces by status."""
@@ -153,6 +193,47 @@ async def test_build_span_tree(db: Database):
     assert tree[0].children[0].children[0].span_id == "grandchild1"
 
 
+@pytest.mark.asyncio
+async def test_build_span_tree_orphans_are_roots(db: Database):
+    """Test that spans whose parent is missing surface as roots."""
+    await db.insert_trace(TraceRecord(trace_id="trace_orphan", started_at=1000.0))
+    await db.insert_spans([
+        SpanRecord(span_id="a", trace_id="trace_orphan", started_at=1000.0),
+        SpanRecord(
+            span_id="b", trace_id="trace_orphan", parent_id="missing", started_at=1001.0
+        ),
+        SpanRecord(span_id="c", trace_id="trace_orphan", parent_id="b", started_at=1002.0),
+    ])
+
+    tree = await db.build_span_tree("trace_orphan")
+    assert [n.span_id for n in tree] == ["a", "b"]
+    assert [n.span_id for n in tree[1].children] == ["c"]
+
+
+@pytest.mark.asyncio
+async def test_get_spans_and_tree_matches_separate_reads(db: Database):
+    """Test that the combined read agrees with the flat list and the CTE tree."""
+    await db.insert_trace(TraceRecord(trace_id="trace_both", started_at=1000.0))
+    await db.insert_spans([
+        SpanRecord(span_id="root", trace_id="trace_both", started_at=1000.0, ended_at=1005.0),
+        # Starts before its parent
+        SpanRecord(span_id="early", trace_id="trace_both", parent_id="late", started_at=1001.0),
+        SpanRecord(span_id="late", trace_id="trace_both", parent_id="root", started_at=1002.0),
+        SpanRecord(span_id="sib", trace_id="trace_both", parent_id="root", started_at=1003.0),
+        SpanRecord(span_id="orphan", trace_id="trace_both", parent_id="gone", started_at=1004.0),
+        # Unreachable from any root: a self-parent and a two-span cycle
+        SpanRecord(span_id="self", trace_id="trace_both", parent_id="self", started_at=1005.0),
+        SpanRecord(span_id="cyc_a", trace_id="trace_both", parent_id="cyc_b", started_at=1006.0),
+        SpanRecord(span_id="cyc_b", trace_id="trace_both", parent_id="cyc_a", started_at=1007.0),
+    ])
+
+    spans, tree = await db.get_spans_and_tree("trace_both")
+    assert spans == await db.get_spans_for_trace("trace_both")
+    assert tree == await db.build_span_tree("trace_both")
+    assert [n.span_id for n in tree] == ["root", "orphan"]
+    assert [n.span_id for n in tree[0].children] == ["late", "sib"]
+
+
 @pytest.mark.asyncio
 async def test_metrics(db: Database):
     """Test aggregated metrics."""
@@ -177,11 +258,41 @@ async def test_metrics(db: Database):
         )
     )
 
+    await db.insert_span(
+        SpanRecord(
+            span_id="gen1",
+            trace_id="t1",
+            span_type=SpanType.GENERATION,
+            started_at=1000.0,
+            span_data={"model": "gpt-4o"},
+            cost=0.01,
+        )
+    )
+
     metrics = await db.get_metrics()
     assert metrics.total_traces == 2
+    assert metrics.total_spans == 1
     assert metrics.total_tokens == 300
     assert abs(metrics.total_cost - 0.03) < 0.0001
+    assert metrics.avg_duration_ms == 7500.0
+    assert metrics.error_count == 0
     assert metrics.traces_by_status.get("completed") == 2
+    assert metrics.cost_by_model == {"gpt-4o": 0.01}
+
+
+@pytest.mark.asyncio
+async def test_reinsert_trace_keeps_spans(db: Database):
+    """Test that re-inserting a trace updates it without cascading to its spans."""
+    await db.insert_trace(TraceRecord(trace_id="t1", started_at=1000.0))
+    await db.insert_span(SpanRecord(span_id="s1", trace_id="t1", started_at=1000.0))
+
+    await db.insert_trace(
+        TraceRecord(trace_id="t1", started_at=1000.0, status=TraceStatus.COMPLETED)
+    )
+
+    trace = await db.get_trace("t1")
+    assert trace.status == TraceStatus.COMPLETED
+    assert [s.span_id for s in await db.get_spans_for_trace("t1")] == ["s1"]
 
 
 @pytest.mark.asyncio
@@ -216,3 +327,212 @@ async def test_export_all(db: Database):
     assert data["version"] == "1.0"
     assert len(data["traces"]) == 1
     assert len(data["traces"][0]["spans"]) == 1
+
+
+@pytest.mark.asyncio
+async def test_export_merges_spans_across_chunks(db: Database, monkeypatch):
+    """Test that spans fetched in chunks are attached to the right traces."""
+    import traceboard.server.database as database
+
+    monkeypatch.setattr(database, "EXPORT_CHUNK_SIZE", 2)
+    counts = {"t0": 3, "t1": 0, "t2": 1, "t3": 4}
+    for i, (trace_id, n) in enumerate(counts.items()):
+        await db.insert_trace(TraceRecord(trace_id=trace_id, started_at=1000.0 - i))
+        await db.insert_spans([
+            SpanRecord(span_id=f"{trace_id}_s{j}", trace_id=trace_id, started_at=1000.0 + j)
+            for j in range(n)
+        ])
+
+    items = [item async for item in db.iter_export()]
+    assert [item["trace"]["trace_id"] for item in items] == list(counts)
+    for item in items:
+        trace_id = item["trace"]["trace_id"]
+        assert [s["span_id"] for s in item["spans"]] == [
+            f"{trace_id}_s{j}" for j in range(counts[trace_id])
+        ]
+
+
+@pytest.mark.asyncio
+async def test_concurrent_reads_share_pool(db: Database):
+    """Test that more concurrent reads than pooled connections all complete."""
+    import asyncio
+
+    await db.insert_trace(TraceRecord(trace_id="t1", started_at=1000.0))
+
+    results = await asyncio.gather(
+        *(db.get_trace("t1") for _ in range(db.pool_size * 3))
+    )
+    assert all(r is not None and r.trace_id == "t1" for r in results)
+
+
+@pytest.mark.asyncio
+async def test_span_lookup_uses_composite_index(db: Database):
+    """Test that per-trace span reads seek the (trace_id, started_at) index."""
+    async with db.db.execute(
+        "EXPLAIN QUERY PLAN SELECT * FROM spans WHERE trace_id = ? ORDER BY started_at ASC",
+        ("t1",),
+    ) as cur:
+        plan = " ".join(row[3] for row in await cur.fetchall())
+    assert "idx_spans_trace_started" in plan
+    assert "TEMP B-TREE" not in plan
+
+
+@pytest.mark.asyncio
+async def test_insert_spans_bulk(db: Database):
+    """Test bulk span insertion via insert_spans."""
+    await db.insert_trace(TraceRecord(trace_id="trace_bulk", started_at=1000.0))
+    await db.insert_spans([
+        SpanRecord(span_id=f"s{i}", trace_id="trace_bulk", started_at=1000.0 + i)
+        for i in range(5)
+    ])
+
+    spans = await db.get_spans_for_trace("trace_bulk")
+    assert [s.span_id for s in spans] == ["s0", "s1", "s2", "s3", "s4"]
+
+
+@pytest.mark.asyncio
+async def test_connection_pragmas(db: Database):
+    """Test that pooled connections run in WAL mode with synchronous=NORMAL."""
+    async with db._reader() as conn:
+        async with conn.execute("PRAGMA journal_mode") as cur:
+            assert (await cur.fetchone())[0] == "wal"
+        async with conn.execute("PRAGMA synchronous") as cur:
+            assert (await cur.fetchone())[0] == 1  # NORMAL
+
+
+def test_sync_connection_pragmas(tmp_path):
+    """Test that the SDK's write connection uses the same tuned PRAGMAs."""
+    sync_db = SyncDatabase(str(tmp_path / "sync.db"))
+    sync_db.connect()
+    try:
+        assert sync_db.conn.execute("PRAGMA journal_mode").fetchone()[0] == "wal"
+        assert sync_db.conn.execute("PRAGMA synchronous").fetchone()[0] == 1
+        assert sync_db.conn.execute("PRAGMA busy_timeout").fetchone()[0] == 5000
+    finally:
+        sync_db.close()
+
+
+def test_sync_update_span_ends(tmp_path):
+    """Test that batched span completions update every span."""
+    sync_db = SyncDatabase(str(tmp_path / "sync.db"))
+    sync_db.connect()
+    try:
+        sync_db.insert_trace(TraceRecord(trace_id="t1", started_at=1000.0))
+        sync_db.insert_spans([
+            SpanRecord(span_id=f"s{i}", trace_id="t1", started_at=1000.0) for i in range(3)
+        ])
+        sync_db.update_span_ends([
+            {"span_id": f"s{i}", "ended_at": 1001.0 + i, "span_data": {"i": i}, "error": None, "cost": 0.1}
+            for i in range(3)
+        ])
+        rows = sync_db.conn.execute(
+            "SELECT span_id, ended_at, span_data FROM spans ORDER BY span_id"
+        ).fetchall()
+        assert rows == [("s0", 1001.0, '{"i":0}'), ("s1", 1002.0, '{"i":1}'), ("s2", 1003.0, '{"i":2}')]
+    finally:
+        sync_db.close()
+
+
+@pytest.mark.asyncio
+async def test_metrics_cache_invalidated_on_write(db: Database):
+    """Test that cached metrics are reused until this instance writes."""
+    first = await db.get_metrics()
+    assert await db.get_metrics() is first
+
+    await db.insert_trace(TraceRecord(trace_id="t1", started_at=1000.0))
+    metrics = await db.get_metrics()
+    assert metrics is not first
+    assert metrics.total_traces == 1
+
+
+@pytest.mark.asyncio
+async def test_large_span_data_compressed(db: Database):
+    """Test that large span payloads are stored compressed and read back intact."""
+    await db.insert_trace(TraceRecord(trace_id="t1", started_at=1000.0))
+    span_data = {"model": "gpt-4o", "output": "lorem ipsum " * 500}
+    await db.insert_span(
+        SpanRecord(
+            span_id="s1",
+            trace_id="t1",
+            span_type=SpanType.GENERATION,
+            started_at=1000.0,
+            span_data=span_data,
+            cost=0.5,
+        )
+    )
+
+    async with db.db.execute("SELECT typeof(span_data) FROM spans") as cur:
+        assert (await cur.fetchone())[0] == "blob"
+
+    spans = await db.get_spans_for_trace("t1")
+    assert spans[0].span_data == span_data
+
+    metrics = await db.get_metrics()
+    assert metrics.cost_by_model == {"gpt-4o": 0.5}
+
+
+def test_wide_ints_fall_back_to_stdlib_json(tmp_path):
+    """Test that integers wider than 64 bits round-trip exactly."""
+    from traceboard import _json
+
+    wide = 2**70
+    assert _json.dumps({"n": wide, "s": "é"}) == f'{{"n":{wide},"s":"é"}}'
+    for value in ({"n": wide}, {"n": -wide, "pad": "x" * 2000}):
+        decoded = _json.unpack(_json.pack(value))
+        assert decoded == value and type(decoded["n"]) is int
+    assert _json.loads(_json.dumpb({"n": wide}, pretty=True)) == {"n": wide}
+
+    sync_db = SyncDatabase(str(tmp_path / "wide.db"))
+    sync_db.connect()
+    try:
+        sync_db.insert_trace(TraceRecord(trace_id="t1", started_at=1000.0, metadata={"id": wide}))
+        row = sync_db.conn.execute("SELECT metadata FROM traces").fetchone()
+    finally:
+        sync_db.close()
+    assert row[0] == f'{{"id":{wide}}}'
+    assert _json.loads(row[0]) == {"id": wide}
+
+
+def test_fragment_survives_stdlib_fallback():
+    """Test that raw span_data fragments aren't stringified by the fallback."""
+    from traceboard import _json
+
+    raw = _json.pack({"tool": "search", "args": {"q": "x" * 2000}})
+    doc = {"n": 2**70, "span_data": _json.fragment(raw)}
+    assert _json.loads(_json.dumps(doc)) == {
+        "n": 2**70,
+        "span_data": {"tool": "search", "args": {"q": "x" * 2000}},
+    }
+
+
+@pytest.mark.asyncio
+async def test_span_model_column_migrated(tmp_path):
+    """Test that pre-existing databases gain a backfilled spans.model column."""
+    import sqlite3
+
+    db_path = str(tmp_path / "old.db")
+    conn = sqlite3.connect(db_path)
+    conn.executescript(
+        """CREATE TABLE traces (trace_id TEXT PRIMARY KEY, workflow_name TEXT NOT NULL DEFAULT '',
+               group_id TEXT, started_at REAL NOT NULL, ended_at REAL,
+               status TEXT NOT NULL DEFAULT 'running', metadata TEXT NOT NULL DEFAULT '{}',
+               total_tokens INTEGER NOT NULL DEFAULT 0, total_cost REAL NOT NULL DEFAULT 0.0);
+           CREATE TABLE spans (span_id TEXT PRIMARY KEY, trace_id TEXT NOT NULL, parent_id TEXT,
+               span_type TEXT NOT NULL DEFAULT 'custom', name TEXT NOT NULL DEFAULT '',
+               started_at REAL NOT NULL, ended_at REAL, span_data TEXT NOT NULL DEFAULT '{}',
+               error TEXT, cost REAL NOT NULL DEFAULT 0.0);
+           INSERT INTO traces (trace_id, started_at) VALUES ('t1', 1000.0);
+           INSERT INTO spans (span_id, trace_id, span_type, started_at, span_data, cost)
+           VALUES ('s1', 't1', 'generation', 1000.0, '{"model": "gpt-4o"}', 0.25);"""
+    )
+    conn.close()
+
+    database = Database(db_path=db_path)
+    await database.connect()
+    try:
+        async with database.db.execute("SELECT model FROM spans") as cur:
+            assert (await cur.fetchone())[0] == "gpt-4o"
+        metrics = await database.get_metrics()
+        assert metrics.cost_by_model == {"gpt-4o": 0.25}
+    finally:
+        await database.close()
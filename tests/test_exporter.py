@@ -87,8 +87,10 @@ async def populated_db():
 
 
 @pytest.mark.asyncio
-async def test_export_json_to_memory(populated_db):
+async def test_export_json_to_memory(populated_db, monkeypatch):
     """Test in-memory JSON export."""
+    # Small span chunks so the merge has to refill mid-trace
+    monkeypatch.setattr("traceboard.sdk.exporter.EXPORT_CHUNK_SIZE", 2)
     exporter = TraceExporter(populated_db)
     data = exporter.export_json()
 
@@ -102,6 +104,16 @@ async def test_export_json_to_memory(populated_db):
     assert "trace" in trace
     assert "spans" in trace
 
+    # Spans are attached to the right trace, in start order
+    spans_by_trace = {
+        t["trace"]["trace_id"]: [s["span_id"] for s in t["spans"]]
+        for t in data["traces"]
+    }
+    assert spans_by_trace == {
+        "trace_002": [],
+        "trace_001": ["span_001", "span_002", "span_003"],
+    }
+
 
 @pytest.mark.asyncio
 async def test_export_json_to_file(populated_db):
@@ -116,6 +128,26 @@ async def test_export_json_to_file(populated_db):
     with open(output, encoding="utf-8") as f:
         loaded = json.load(f)
     assert loaded["trace_count"] == 2
+    # Without stream=True the full export is still returned
+    assert loaded == data
+
+
+@pytest.mark.asyncio
+async def test_export_json_to_file_streams(populated_db):
+    """Test that a streamed file export returns only header fields."""
+    tmpdir = tempfile.mkdtemp()
+    output = os.path.join(tmpdir, "export_compact.json")
+
+    exporter = TraceExporter(populated_db)
+    header = exporter.export_json(output, pretty=False, stream=True)
+
+    assert header["trace_count"] == 2
+    assert "traces" not in header
+    with open(output, encoding="utf-8") as f:
+        loaded = json.load(f)
+    assert loaded["trace_count"] == 2
+    assert [t["trace"]["trace_id"] for t in loaded["traces"]] == ["trace_002", "trace_001"]
+    assert len(loaded["traces"][1]["spans"]) == 3
 
 
 @pytest.mark.asyncio
@@ -151,9 +183,10 @@ async def test_export_csv_to_file(populated_db):
     output = os.path.join(tmpdir, "traces.csv")
 
     exporter = TraceExporter(populated_db)
-    exporter.export_csv(output, include_spans=True)
+    content = exporter.export_csv(output, include_spans=True)
 
-    assert os.path.exists(output)
+    with open(output, encoding="utf-8", newline="") as f:
+        assert f.read() == content
     spans_path = os.path.join(tmpdir, "traces_spans.csv")
     assert os.path.exists(spans_path)
 
@@ -177,6 +210,21 @@ async def test_export_csv_without_spans(populated_db):
     assert not os.path.exists(spans_path)
 
 
+@pytest.mark.asyncio
+async def test_export_csv_streams(populated_db):
+    """Test streamed CSV export without spans file."""
+    tmpdir = tempfile.mkdtemp()
+    output = os.path.join(tmpdir, "traces_only.csv")
+
+    exporter = TraceExporter(populated_db)
+    assert exporter.export_csv(output, include_spans=False, stream=True) == ""
+
+    with open(output, encoding="utf-8") as f:
+        assert len(f.read().strip().split("\n")) == 3  # header + 2 traces
+    spans_path = os.path.join(tmpdir, "traces_only_spans.csv")
+    assert not os.path.exists(spans_path)
+
+
 @pytest.mark.asyncio
 async def test_export_nonexistent_db():
     """Test export from non-existent database."""
@@ -0,0 +1,27 @@
+"""Tests for traceboard.init()."""
+
+import importlib
+
+import agents.tracing
+
+import traceboard
+
+
+def test_init_survives_preload_errors(tmp_path, monkeypatch):
+    """Test that a failing concurrent preload falls back to normal imports."""
+    def broken_import(name, package=None):
+        raise RuntimeError("deadlock detected by _ModuleLock")
+
+    registered = []
+    monkeypatch.setattr(importlib, "import_module", broken_import)
+    monkeypatch.setattr(agents.tracing, "add_trace_processor", registered.append)
+    monkeypatch.setattr(traceboard, "_openai_processor", None)
+
+    adapters = traceboard.init(
+        db_path=str(tmp_path / "init.db"), frameworks=["openai", "anthropic"]
+    )
+    try:
+        assert list(adapters) == ["openai"]
+        assert registered == [adapters["openai"]]
+    finally:
+        adapters["openai"].shutdown()
@@ -85,6 +85,7 @@ class TestTraceBoardProcessor:
 
         self.processor.on_trace_start(trace)
         self.processor.on_trace_end(trace)
+        self.processor.force_flush()
 
         # Verify the trace was written (check via sync db)
         import sqlite3
@@ -116,6 +117,7 @@ class TestTraceBoardProcessor:
         self.processor.on_span_start(span)
         self.processor.on_span_end(span)
         self.processor.on_trace_end(trace)
+        self.processor.force_flush()
 
         # Verify the span was written
         import sqlite3
@@ -150,6 +152,7 @@ class TestTraceBoardProcessor:
         self.processor.on_span_start(span)
         self.processor.on_span_end(span)
         self.processor.on_trace_end(trace)
+        self.processor.force_flush()
 
         import sqlite3
 
@@ -182,6 +185,7 @@ class TestTraceBoardProcessor:
         self.processor.on_span_start(span2)
         self.processor.on_span_end(span2)
         self.processor.on_trace_end(trace)
+        self.processor.force_flush()
 
         import sqlite3
 
@@ -198,3 +202,125 @@ class TestTraceBoardProcessor:
     def test_force_flush_noop(self):
         """Test that force_flush doesn't raise."""
         self.processor.force_flush()
+
+    def test_writes_run_on_writer_thread(self):
+        """Test that callbacks enqueue and the writer thread commits in batches."""
+        import sqlite3
+        import threading
+
+        write_threads = set()
+        transaction = self.processor._db.transaction
+
+        def tracking_transaction():
+            write_threads.add(threading.get_ident())
+            return transaction()
+
+        self.processor._db.transaction = tracking_transaction
+
+        trace = MockTrace()
+        self.processor.on_trace_start(trace)
+        for i in range(120):
+            span = MockSpan(f"span_{i}", trace.trace_id, span_data=MockFunctionSpanData())
+            self.processor.on_span_start(span)
+            self.processor.on_span_end(span)
+        self.processor.on_trace_end(trace)
+        self.processor.force_flush()
+
+        assert write_threads == {self.processor._writer.ident}
+
+        conn = sqlite3.connect(self.db_path)
+        count = conn.execute("SELECT COUNT(*) FROM spans").fetchone()[0]
+        conn.close()
+        assert count == 120
+
+    def test_force_flush_writes_pending(self):
+        """Test that force_flush commits queued writes mid-trace."""
+        import sqlite3
+
+        trace = MockTrace()
+        self.processor.on_trace_start(trace)
+        self.processor.force_flush()
+
+        conn = sqlite3.connect(self.db_path)
+        row = conn.execute(
+            "SELECT status FROM traces WHERE trace_id = ?", (trace.trace_id,)
+        ).fetchone()
+        conn.close()
+        assert row == ("running",)
+
+
+def test_sample_bucket_is_stable_across_processes():
+    """Test that sampling buckets don't depend on the per-process hash seed."""
+    from traceboard.sdk.processor import _sample_bucket
+
+    assert _sample_bucket("trace_abc") == 21798
+    assert _sample_bucket("trace_0123456789abcdef") == 43102
+
+
+def test_sampling_drops_traces_but_keeps_errors(tmp_path):
+    """Test that unsampled traces are skipped unless a span fails."""
+    import sqlite3
+
+    db_path = str(tmp_path / "sampled.db")
+    processor = TraceBoardProcessor(TraceboardConfig(db_path=db_path, sample_rate=0.0))
+    try:
+        ok = MockTrace(trace_id="trace_ok")
+        failed = MockTrace(trace_id="trace_failed")
+        ok_span = MockSpan("span_ok", ok.trace_id, span_data=MockFunctionSpanData())
+        bad_span = MockSpan("span_bad", failed.trace_id, span_data=MockFunctionSpanData())
+        bad_span.error = {"message": "boom"}
+
+        for trace, span in ((ok, ok_span), (failed, bad_span)):
+            processor.on_trace_start(trace)
+            processor.on_span_start(span)
+            processor.on_span_end(span)
+            processor.on_trace_end(trace)
+        processor.force_flush()
+    finally:
+        processor.shutdown()
+
+    conn = sqlite3.connect(db_path)
+    traces = conn.execute("SELECT trace_id, status FROM traces").fetchall()
+    spans = conn.execute("SELECT span_id, error FROM spans").fetchall()
+    conn.close()
+    assert traces == [("trace_failed", "completed")]
+    assert spans == [("span_bad", '{"message":"boom"}')]
+
+
+def test_sampling_keeps_every_failure_and_its_ancestors(tmp_path):
+    """Test that a promoted trace keeps all later failures and open parents."""
+    import sqlite3
+
+    db_path = str(tmp_path / "sampled.db")
+    processor = TraceBoardProcessor(TraceboardConfig(db_path=db_path, sample_rate=0.0))
+    try:
+        trace = MockTrace(trace_id="trace_failed")
+        agent = MockSpan("agent", trace.trace_id)
+        fine = MockSpan("fine", trace.trace_id, parent_id="agent", span_data=MockFunctionSpanData())
+        tool = MockSpan("tool", trace.trace_id, parent_id="agent", span_data=MockFunctionSpanData())
+        tool2 = MockSpan("tool2", trace.trace_id, parent_id="agent", span_data=MockFunctionSpanData())
+        tool.error = {"message": "boom"}
+        tool2.error = {"message": "again"}
+
+        processor.on_trace_start(trace)
+        processor.on_span_start(agent)
+        for span in (fine, tool, tool2):
+            processor.on_span_start(span)
+            processor.on_span_end(span)
+        processor.on_span_end(agent)
+        processor.on_trace_end(trace)
+        processor.force_flush()
+    finally:
+        processor.shutdown()
+
+    conn = sqlite3.connect(db_path)
+    spans = conn.execute(
+        "SELECT span_id, parent_id, error, ended_at IS NOT NULL FROM spans ORDER BY span_id"
+    ).fetchall()
+    conn.close()
+    # "fine" ended cleanly before the first failure, so it stays unsampled
+    assert spans == [
+        ("agent", None, None, 1),
+        ("tool", "agent", '{"message":"boom"}', 1),
+        ("tool2", "agent", '{"message":"again"}', 1),
+    ]
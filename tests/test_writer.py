@@ -0,0 +1,51 @@
+"""Tests for the SDK's BackgroundWriter."""
+
+import logging
+from functools import partial
+
+from traceboard.sdk._writer import BackgroundWriter
+from traceboard.server.database import SyncDatabase
+from traceboard.server.models import SpanRecord, TraceRecord
+
+
+def _open(tmp_path) -> SyncDatabase:
+    db = SyncDatabase(str(tmp_path / "writer.db"))
+    db.connect()
+    return db
+
+
+def test_failed_write_only_drops_itself(tmp_path, caplog):
+    """Test that one bad operation doesn't roll back the rest of its batch."""
+    db = _open(tmp_path)
+    writer = BackgroundWriter(db)
+    try:
+        batch = [
+            partial(db.insert_trace, TraceRecord(trace_id="t1", started_at=1000.0)),
+            # Its trace was never started, so the foreign key check fails
+            partial(db.insert_span, SpanRecord(span_id="orphan", trace_id="nope", started_at=1000.0)),
+            partial(db.insert_span, SpanRecord(span_id="s1", trace_id="t1", started_at=1000.0)),
+            partial(db.insert_trace, TraceRecord(trace_id="t2", started_at=1001.0, metadata={"n": 2**70})),
+        ]
+        with caplog.at_level(logging.ERROR, logger="traceboard"):
+            writer._write_batch(batch)
+
+        traces = [r[0] for r in db.conn.execute("SELECT trace_id FROM traces ORDER BY trace_id")]
+        spans = [r[0] for r in db.conn.execute("SELECT span_id FROM spans")]
+        assert traces == ["t1", "t2"]
+        assert spans == ["s1"]
+        assert len(caplog.records) == 1
+    finally:
+        writer.close()
+        db.close()
+
+
+def test_submit_after_close_warns(tmp_path, caplog):
+    """Test that writes submitted after close() are reported, not silently lost."""
+    db = _open(tmp_path)
+    writer = BackgroundWriter(db)
+    writer.close()
+
+    with caplog.at_level(logging.WARNING, logger="traceboard"):
+        writer.submit(partial(db.insert_trace, TraceRecord(trace_id="t1", started_at=1000.0)))
+    assert "after the writer closed" in caplog.text
+    db.close()
@@ -12,8 +12,13 @@ Usage::
     traceboard.init(frameworks=["openai", "anthropic", "langchain", "litellm"])
 """
 
-from traceboard.config import TraceboardConfig
-from traceboard.sdk.exporter import TraceExporter
+from __future__ import annotations
+
+from typing import TYPE_CHECKING
+
+if TYPE_CHECKING:
+    from traceboard.config import TraceboardConfig
+    from traceboard.sdk.exporter import TraceExporter
 
 __version__ = "0.2.0"
 __all__ = [
@@ -27,7 +32,10 @@ __all__ = [
     "TraceExporter",
 ]
 
+import importlib
 import logging
+import threading
+from functools import lru_cache
 
 logger = logging.getLogger("traceboard")
 
@@ -37,6 +45,8 @@ _anthropic_tracer = None
 _langchain_handler = None
 _litellm_logger = None
 
+_dashboard_opened = False
+
 
 def init(
     db_path: str = "./traceboard.db",
@@ -59,25 +69,20 @@ def init(
     Returns:
         A dict mapping framework names to their adapter instances.
     """
-    config = TraceboardConfig(db_path=db_path)
+    config = _config_for(db_path)
     adapters: dict[str, object] = {}
 
     # Determine which frameworks to try
-    all_frameworks = ["openai", "anthropic", "langchain", "litellm"]
-    targets = frameworks if frameworks is not None else all_frameworks
+    targets = frameworks if frameworks is not None else list(_INIT_DISPATCH)
+    _preload_frameworks(targets)
 
     for fw in targets:
+        init_fn = _INIT_DISPATCH.get(fw)
+        if init_fn is None:
+            logger.warning("TraceBoard: unknown framework %r", fw)
+            continue
         try:
-            if fw == "openai":
-                adapters["openai"] = _init_openai(config)
-            elif fw == "anthropic":
-                adapters["anthropic"] = _init_anthropic(config)
-            elif fw == "langchain":
-                adapters["langchain"] = _init_langchain(config)
-            elif fw == "litellm":
-                adapters["litellm"] = _init_litellm(config)
-            else:
-                logger.warning("TraceBoard: unknown framework %r", fw)
+            adapters[fw] = init_fn(config)
         except ImportError:
             if frameworks is not None:
                 # User explicitly requested this framework — warn loudly
@@ -92,9 +97,12 @@ def init(
             "openai-agents, anthropic, langchain-core, litellm"
         )
 
-    if auto_open:
-        import webbrowser
-        webbrowser.open("http://localhost:8745")
+    global _dashboard_opened
+    if auto_open and not _dashboard_opened:
+        from traceboard._browser import open_url
+
+        open_url("http://localhost:8745")
+        _dashboard_opened = True
 
     logger.info("TraceBoard initialized — %s", ", ".join(adapters) or "no adapters")
     return adapters
@@ -105,7 +113,7 @@ def init(
 
 def init_openai(db_path: str = "./traceboard.db") -> object:
     """Initialize tracing for OpenAI Agents SDK only."""
-    return _init_openai(TraceboardConfig(db_path=db_path))
+    return _init_openai(_config_for(db_path))
 
 
 def init_anthropic(db_path: str = "./traceboard.db") -> object:
@@ -115,7 +123,7 @@ def init_anthropic(db_path: str = "./traceboard.db") -> object:
     method to wrap an existing client, or call it without arguments to
     create a new instrumented ``Anthropic()`` client.
     """
-    return _init_anthropic(TraceboardConfig(db_path=db_path))
+    return _init_anthropic(_config_for(db_path))
 
 
 def init_langchain(db_path: str = "./traceboard.db") -> object:
@@ -124,7 +132,7 @@ def init_langchain(db_path: str = "./traceboard.db") -> object:
     Returns a ``TraceBoardCallbackHandler`` instance.  Pass it to
     LangChain via the ``callbacks`` parameter.
     """
-    return _init_langchain(TraceboardConfig(db_path=db_path))
+    return _init_langchain(_config_for(db_path))
 
 
 def init_litellm(db_path: str = "./traceboard.db") -> object:
@@ -132,14 +140,74 @@ def init_litellm(db_path: str = "./traceboard.db") -> object:
 
     Automatically registers a callback logger with ``litellm.callbacks``.
     """
-    return _init_litellm(TraceboardConfig(db_path=db_path))
+    return _init_litellm(_config_for(db_path))
 
 
 # ── Internal init helpers ──────────────────────────────────────────────
 
 
+@lru_cache(maxsize=8)
+def _config_for(db_path: str) -> TraceboardConfig:
+    """Return the shared (frozen) config for ``db_path``."""
+    from traceboard.config import TraceboardConfig
+
+    return TraceboardConfig(db_path=db_path)
+
+
+# Top-level SDK module each framework adapter depends on
+_FRAMEWORK_MODULES: dict[str, str] = {
+    "openai": "agents",
+    "anthropic": "anthropic",
+    "langchain": "langchain_core",
+    "litellm": "litellm",
+}
+
+
+# Serializes concurrent init() calls' preloading
+_preload_lock = threading.Lock()
+
+
+def _preload_frameworks(targets: list[str]) -> None:
+    """Import the SDKs for ``targets`` concurrently.
+
+    These imports dominate ``init()`` when auto-detecting, and much of
+    their time is file I/O that overlaps well across threads.  This is
+    only a warm-up: adapters are still created one at a time afterwards,
+    and their own imports decide whether a framework is installed, so a
+    failure here (e.g. a partially initialised module seen by a
+    concurrent import) just falls back to a normal serial import.
+    """
+    modules = {fw: _FRAMEWORK_MODULES[fw] for fw in targets if fw in _FRAMEWORK_MODULES}
+    if len(modules) < 2:
+        return
+
+    from concurrent.futures import ThreadPoolExecutor
+
+    with _preload_lock, ThreadPoolExecutor(max_workers=len(modules)) as pool:
+        futures = {
+            fw: pool.submit(importlib.import_module, name)
+            for fw, name in modules.items()
+        }
+        for fw, future in futures.items():
+            try:
+                future.result()
+            except Exception as exc:
+                # Not just ImportError: racing first imports can also hit
+                # the import lock's deadlock RuntimeError or an
+                # AttributeError from a half-initialised module
+                logger.debug("TraceBoard: preloading %r failed: %r", fw, exc)
+
+
 def _init_openai(config: TraceboardConfig) -> object:
     global _openai_processor
+    # Re-init for the same database reuses the registered processor rather
+    # than adding a second one (and a second SQLite connection).
+    if (
+        _openai_processor is not None
+        and _openai_processor.config.db_path == config.db_path
+    ):
+        return _openai_processor
+
     from agents.tracing import add_trace_processor
     from traceboard.sdk.processor import TraceBoardProcessor
 
@@ -181,17 +249,52 @@ def _init_litellm(config: TraceboardConfig) -> object:
 
     from traceboard.sdk.litellm_logger import TraceBoardLiteLLMLogger
 
-    _litellm_logger = TraceBoardLiteLLMLogger(config=config)
-    if not isinstance(litellm.callbacks, list):
-        litellm.callbacks = []
-    litellm.callbacks.append(_litellm_logger)
+    # As with OpenAI, re-init for the same database keeps the one logger
+    # instead of registering a duplicate that would run on every call.
+    if _litellm_logger is None or _litellm_logger.config.db_path != config.db_path:
+        _litellm_logger = TraceBoardLiteLLMLogger(config=config)
+    callbacks = litellm.callbacks if isinstance(litellm.callbacks, list) else []
+    if not any(cb is _litellm_logger for cb in callbacks):
+        callbacks.append(_litellm_logger)
+    litellm.callbacks = callbacks
     logger.info("TraceBoard: LiteLLM logger registered")
     return _litellm_logger
 
 
+# Framework name -> adapter initializer, in auto-detect order
+_INIT_DISPATCH = {
+    "openai": _init_openai,
+    "anthropic": _init_anthropic,
+    "langchain": _init_langchain,
+    "litellm": _init_litellm,
+}
+
+
 # ── Accessor ───────────────────────────────────────────────────────────
 
 
 def get_processor():
     """Get the OpenAI Agents SDK processor, or None."""
     return _openai_processor
+
+
+# Lazy imports — even the dataclass-based config costs a few ms of import
+# time (dataclasses pulls in inspect), and traceboard.sdk pulls in the
+# Agents SDK processor; ``import traceboard`` alone should pay for neither.
+_LAZY_IMPORTS: dict[str, str] = {
+    "TraceboardConfig": "traceboard.config",
+    "TraceExporter": "traceboard.sdk.exporter",
+}
+
+
+def __getattr__(name: str):
+    module = _LAZY_IMPORTS.get(name)
+    if module is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(importlib.import_module(module), name)
+    globals()[name] = value
+    return value
+
+
+def __dir__() -> list[str]:
+    return sorted(set(globals()) | set(__all__))
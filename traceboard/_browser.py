@@ -0,0 +1,43 @@
+"""Open the dashboard in the user's browser.
+
+Spawns the platform's URL opener directly rather than going through
+``webbrowser``, which imports and probes a registry of browsers first.
+"""
+
+from __future__ import annotations
+
+import os
+import shutil
+import subprocess
+import sys
+
+
+def open_url(url: str) -> None:
+    """Open ``url`` in the default browser without waiting for it."""
+    if os.environ.get("BROWSER"):
+        # Honour an explicit $BROWSER choice, which only webbrowser parses
+        _open_with_webbrowser(url)
+        return
+    if sys.platform == "win32":
+        os.startfile(url)  # type: ignore[attr-defined]
+        return
+
+    opener = "open" if sys.platform == "darwin" else shutil.which("xdg-open")
+    if opener is None:
+        # No desktop opener (e.g. a bare Linux box) — let webbrowser try
+        _open_with_webbrowser(url)
+        return
+
+    subprocess.Popen(
+        [opener, url],
+        stdin=subprocess.DEVNULL,
+        stdout=subprocess.DEVNULL,
+        stderr=subprocess.DEVNULL,
+        start_new_session=True,
+    )
+
+
+def _open_with_webbrowser(url: str) -> None:
+    import webbrowser
+
+    webbrowser.open(url)
@@ -0,0 +1,99 @@
+"""JSON encoding helpers for TraceBoard, backed by ``orjson``.
+
+All storage (``span_data``, ``metadata``, ``error`` columns) and export
+paths go through these helpers so the encoder options stay consistent.
+"""
+
+from __future__ import annotations
+
+import json
+import re
+import zlib
+from typing import Any
+
+import orjson
+
+# Non-string dict keys are coerced like ``json.dumps`` does; unknown
+# objects fall back to ``str()`` instead of raising.
+_OPTIONS = orjson.OPT_NON_STR_KEYS
+
+JSONDecodeError = orjson.JSONDecodeError
+
+# Stored payloads at least this large are zlib-compressed into a BLOB;
+# smaller ones stay plain JSON text.
+COMPRESS_MIN_BYTES = 1024
+_COMPRESS_LEVEL = 3
+
+
+def dumpb(value: Any, *, pretty: bool = False) -> bytes:
+    """Encode ``value`` to UTF-8 JSON bytes."""
+    option = _OPTIONS | orjson.OPT_INDENT_2 if pretty else _OPTIONS
+    try:
+        return orjson.dumps(value, default=str, option=option)
+    except TypeError:
+        # orjson rejects integers wider than 64 bits, which stdlib json
+        # encodes fine; they do turn up in user metadata and tool args.
+        return _stdlib_dumps(value, pretty).encode("utf-8")
+
+
+def _stdlib_default(obj: Any) -> Any:
+    if isinstance(obj, orjson.Fragment):
+        # Fragments hold pre-encoded JSON (stored span_data); stdlib json
+        # can't splice raw text, so re-encode the same value in its place.
+        return loads(orjson.dumps(obj))
+    return str(obj)
+
+
+def _stdlib_dumps(value: Any, pretty: bool) -> str:
+    if pretty:
+        return json.dumps(value, default=_stdlib_default, ensure_ascii=False, indent=2)
+    return json.dumps(
+        value, default=_stdlib_default, ensure_ascii=False, separators=(",", ":")
+    )
+
+
+def dumps(value: Any, *, pretty: bool = False) -> str:
+    """Encode ``value`` to a JSON string."""
+    return dumpb(value, pretty=pretty).decode("utf-8")
+
+
+# orjson decodes integers wider than 64 bits as floats, losing digits.
+# Any 19+ digit run might be one (2**63 has 19 digits); such documents
+# are decoded by stdlib json instead, which keeps them exact.
+_LONG_DIGITS = re.compile(r"\d{19}")
+_LONG_DIGITS_B = re.compile(rb"\d{19}")
+
+
+def loads(data: str | bytes) -> Any:
+    """Decode a JSON document from ``str`` or ``bytes``."""
+    pattern = _LONG_DIGITS_B if isinstance(data, bytes) else _LONG_DIGITS
+    if pattern.search(data) is not None:
+        return json.loads(data)
+    return orjson.loads(data)
+
+
+def pack(value: Any) -> str | bytes:
+    """Encode ``value`` for a storage column, compressing large payloads."""
+    raw = dumpb(value)
+    if len(raw) < COMPRESS_MIN_BYTES:
+        return raw.decode("utf-8")
+    return zlib.compress(raw, _COMPRESS_LEVEL)
+
+
+def unpack_text(data: str | bytes) -> str:
+    """Return the JSON text of a stored value, decompressing BLOBs."""
+    if isinstance(data, bytes):
+        return zlib.decompress(data).decode("utf-8")
+    return data
+
+
+def fragment(data: str | bytes) -> orjson.Fragment:
+    """Wrap a stored value so encoding embeds its JSON without parsing it."""
+    return orjson.Fragment(unpack_text(data))
+
+
+def unpack(data: str | bytes) -> Any:
+    """Decode a value written by :func:`pack` (or plain JSON text)."""
+    if isinstance(data, bytes):
+        data = zlib.decompress(data)
+    return loads(data)
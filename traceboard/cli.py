@@ -9,10 +9,8 @@ Usage:
 
 from __future__ import annotations
 
-import json
+import os
 import sys
-import asyncio
-from pathlib import Path
 
 import click
 
@@ -34,26 +32,16 @@ def ui(port: int, host: str, db: str, no_open: bool):
     import uvicorn
     from traceboard.server.app import create_app
 
-    db_path = str(Path(db).resolve())
-    app = create_app(db_path=db_path)
+    db_path = os.path.abspath(db)
+    url = f"http://{host}:{port}"
+    app = create_app(db_path=db_path, browser_url=None if no_open else url)
 
     click.echo(f"")
     click.echo(f"  TraceBoard v0.1.1")
-    click.echo(f"  Dashboard: http://{host}:{port}")
+    click.echo(f"  Dashboard: {url}")
     click.echo(f"  Database:  {db_path}")
     click.echo(f"")
 
-    if not no_open:
-        import webbrowser
-        import threading
-
-        def open_browser():
-            import time
-            time.sleep(1.5)
-            webbrowser.open(f"http://{host}:{port}")
-
-        threading.Thread(target=open_browser, daemon=True).start()
-
     uvicorn.run(app, host=host, port=port, log_level="warning")
 
 
@@ -62,12 +50,14 @@ def ui(port: int, host: str, db: str, no_open: bool):
 @click.confirmation_option(prompt="This will delete ALL trace data. Continue?")
 def clean(db: str):
     """Delete all trace data."""
-    db_path = str(Path(db).resolve())
+    db_path = os.path.abspath(db)
 
-    if not Path(db_path).exists():
+    if not os.path.exists(db_path):
         click.echo(f"No database found at {db_path}")
         return
 
+    import asyncio
+
     async def _clean():
         from traceboard.server.database import Database
         database = Database(db_path=db_path)
@@ -87,9 +77,9 @@ def clean(db: str):
 @click.option("--pretty", is_flag=True, help="Pretty-print JSON output")
 def export(db: str, output: str | None, fmt: str, pretty: bool):
     """Export all traces to JSON or CSV."""
-    db_path = str(Path(db).resolve())
+    db_path = os.path.abspath(db)
 
-    if not Path(db_path).exists():
+    if not os.path.exists(db_path):
         click.echo(f"No database found at {db_path}", err=True)
         sys.exit(1)
 
@@ -100,19 +90,18 @@ def export(db: str, output: str | None, fmt: str, pretty: bool):
     if fmt == "csv":
         if not output:
             output = "traceboard_export.csv"
-        exporter.export_csv(output)
+        exporter.export_csv(output, stream=True)
         click.echo(f"Exported traces to {output}")
-        spans_path = Path(output).with_name(f"{Path(output).stem}_spans.csv")
-        if spans_path.exists():
+        spans_path = f"{os.path.splitext(output)[0]}_spans.csv"
+        if os.path.exists(spans_path):
             click.echo(f"Exported spans  to {spans_path}")
     else:
-        data = exporter.export_json(output, pretty=pretty or (output is not None))
         if output:
+            data = exporter.export_json(output, pretty=True, stream=True)
             count = data.get("trace_count", 0)
             click.echo(f"Exported {count} traces to {output}")
         else:
-            indent = 2 if pretty else None
-            click.echo(json.dumps(data, indent=indent, ensure_ascii=False, default=str))
+            exporter.export_json_stream(sys.stdout.buffer, pretty=pretty)
 
 
 if __name__ == "__main__":
@@ -1,9 +1,9 @@
 """TraceBoard configuration."""
 
-from dataclasses import dataclass, field
+from dataclasses import dataclass
 
 
-@dataclass
+@dataclass(frozen=True, slots=True)
 class TraceboardConfig:
     """Configuration for TraceBoard."""
 
@@ -20,4 +20,14 @@ class TraceboardConfig:
     """Number of items to batch before flushing to SQLite."""
 
     flush_interval: float = 2.0
-    """Seconds between automatic flushes."""
+    """Deprecated and ignored: the background writer commits as soon as
+    writes are queued. Kept so existing configs still construct."""
+
+    enabled: bool = True
+    """Record traces; when False, SDK adapters skip all recording work."""
+
+    sample_rate: float = 1.0
+    """Fraction of Agents SDK traces to record; traces with errors are always kept."""
+
+    max_pending_runs: int = 10_000
+    """In-flight calls an SDK adapter tracks before dropping the oldest."""
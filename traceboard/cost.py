@@ -10,10 +10,18 @@ Sources:
 
 from __future__ import annotations
 
+import sys
+from collections.abc import Mapping
+from functools import lru_cache
+from types import MappingProxyType
+
 # ── Pricing table ──────────────────────────────────────────────────────────
 # Format: model_name -> (input_price_per_1M, output_price_per_1M)
+# Read-only, so the per-token table derived below can never go stale.
+# Keys are interned so lookups with interned ingest-side names (see the
+# processor and BaseTracer) hit the identity fast path in dict compares.
 
-MODEL_PRICES: dict[str, tuple[float, float]] = {
+MODEL_PRICES: Mapping[str, tuple[float, float]] = MappingProxyType({sys.intern(k): v for k, v in {
     # ── GPT-5.2 ────────────────────────────────────────────────────────
     "gpt-5.2": (1.75, 14.00),
     "gpt-5.2-chat-latest": (1.75, 14.00),
@@ -214,12 +222,51 @@ MODEL_PRICES: dict[str, tuple[float, float]] = {
     "mistral-nemo": (0.02, 0.04),
     "codestral-latest": (0.30, 0.90),
     "mistral-embed": (0.10, 0.10),
-}
+}.items()})
 
 # Default fallback price for unknown models
 DEFAULT_PRICE: tuple[float, float] = (2.00, 8.00)
 
-
+# Per-token prices as integers in units of 1e-10 USD (listed prices have at
+# most four decimals per 1M tokens), so calculate_cost is exact integer
+# multiply-adds with no float rounding on the hot path.
+_PRICE_SCALE = 10_000
+_PER_TOKEN_PRICES: Mapping[str, tuple[int, int]] = MappingProxyType({
+    model: (round(input_price * _PRICE_SCALE), round(output_price * _PRICE_SCALE))
+    for model, (input_price, output_price) in MODEL_PRICES.items()
+})
+_DEFAULT_PER_TOKEN: tuple[int, int] = (
+    round(DEFAULT_PRICE[0] * _PRICE_SCALE),
+    round(DEFAULT_PRICE[1] * _PRICE_SCALE),
+)
+
+# Longest first, so the most specific family wins a prefix match
+_PREFIX_KEYS: tuple[str, ...] = tuple(sorted(MODEL_PRICES, key=len, reverse=True))
+_PREFIX_BOUNDARY = frozenset("-:@.")
+
+
+@lru_cache(maxsize=1024)
+def _resolve_model(model: str) -> str | None:
+    """Map a model name to its MODEL_PRICES key, or None if unknown.
+
+    Tries an exact match, then drops a ``provider/`` prefix, then falls
+    back to the longest known name that ``model`` extends — so dated or
+    tagged variants like ``gpt-4o-2026-03-01`` price as ``gpt-4o``.
+    """
+    if model in MODEL_PRICES:
+        return model
+    name = model.rpartition("/")[2]
+    if name in MODEL_PRICES:
+        return name
+    for key in _PREFIX_KEYS:
+        if name.startswith(key) and name[len(key):len(key) + 1] in _PREFIX_BOUNDARY:
+            return key
+    return None
+
+
+# Spans repeat the same (model, tokens) triple often enough — cached
+# completions, replays, fixtures — that memoizing beats recomputing.
+@lru_cache(maxsize=4096)
 def calculate_cost(
     model: str,
     input_tokens: int = 0,
@@ -235,9 +282,13 @@ def calculate_cost(
     Returns:
         Cost in USD.
     """
-    input_price, output_price = MODEL_PRICES.get(model, DEFAULT_PRICE)
-    cost = (input_tokens * input_price + output_tokens * output_price) / 1_000_000
-    return round(cost, 8)
+    key = _resolve_model(model)
+    input_price, output_price = (
+        _PER_TOKEN_PRICES[key] if key is not None else _DEFAULT_PER_TOKEN
+    )
+    units = input_tokens * input_price + output_tokens * output_price
+    # 1e-10 USD units -> USD rounded half-up to 8 decimals
+    return (units + 50) // 100 / 100_000_000
 
 
 def get_model_price(model: str) -> tuple[float, float]:
@@ -246,4 +297,5 @@ def get_model_price(model: str) -> tuple[float, float]:
     Returns:
         Tuple of (input_price_per_1M, output_price_per_1M).
     """
-    return MODEL_PRICES.get(model, DEFAULT_PRICE)
+    key = _resolve_model(model)
+    return MODEL_PRICES[key] if key is not None else DEFAULT_PRICE
@@ -1,27 +1,39 @@
 """TraceBoard SDK — tracing adapters for multiple LLM frameworks."""
 
-from traceboard.sdk._base import BaseTracer
-from traceboard.sdk.exporter import TraceExporter
-from traceboard.sdk.processor import TraceBoardProcessor
+from __future__ import annotations
+
+import importlib
 
 __all__ = [
     "BaseTracer",
     "TraceBoardProcessor",
     "TraceExporter",
+    "AnthropicTracer",
+    "TraceBoardCallbackHandler",
+    "TraceBoardLiteLLMLogger",
 ]
 
-# Lazy imports for optional adapters — avoids ImportError when
-# anthropic / langchain / litellm are not installed.
+# Every name is imported on first access — avoids ImportError when
+# anthropic / langchain / litellm are not installed, and keeps e.g. the
+# exporter from pulling in the Agents SDK via TraceBoardProcessor.
+_LAZY_IMPORTS: dict[str, str] = {
+    "BaseTracer": "traceboard.sdk._base",
+    "TraceBoardProcessor": "traceboard.sdk.processor",
+    "TraceExporter": "traceboard.sdk.exporter",
+    "AnthropicTracer": "traceboard.sdk.anthropic_tracer",
+    "TraceBoardCallbackHandler": "traceboard.sdk.langchain_handler",
+    "TraceBoardLiteLLMLogger": "traceboard.sdk.litellm_logger",
+}
 
 
 def __getattr__(name: str):
-    if name == "AnthropicTracer":
-        from traceboard.sdk.anthropic_tracer import AnthropicTracer
-        return AnthropicTracer
-    if name == "TraceBoardCallbackHandler":
-        from traceboard.sdk.langchain_handler import TraceBoardCallbackHandler
-        return TraceBoardCallbackHandler
-    if name == "TraceBoardLiteLLMLogger":
-        from traceboard.sdk.litellm_logger import TraceBoardLiteLLMLogger
-        return TraceBoardLiteLLMLogger
-    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    module = _LAZY_IMPORTS.get(name)
+    if module is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(importlib.import_module(module), name)
+    globals()[name] = value
+    return value
+
+
+def __dir__() -> list[str]:
+    return sorted(set(globals()) | set(__all__))
@@ -9,19 +9,26 @@ of which adapter produced the data.
 
 from __future__ import annotations
 
+import copy
 import logging
-import threading
+import os
+import sys
 import time
-import uuid
+from functools import partial
 from typing import Any
 
 from traceboard.config import TraceboardConfig
 from traceboard.cost import calculate_cost
+from traceboard.sdk._writer import BackgroundWriter
 from traceboard.server.database import SyncDatabase
 from traceboard.server.models import SpanRecord, SpanType, TraceRecord, TraceStatus
 
 logger = logging.getLogger("traceboard")
 
+# Recorded inputs/outputs are cut to this many characters. Slicing a str
+# that is already short enough returns the same object, so no guard is needed.
+MAX_TEXT_CHARS = 2000
+
 
 class BaseTracer:
     """Thread-safe base class that writes traces and spans to SQLite.
@@ -29,20 +36,43 @@ class BaseTracer:
     Subclasses only need to call :meth:`record_llm_start` when an LLM
     call begins and :meth:`record_llm_end` when it completes.  All
     database operations, cost calculation, and token aggregation are
-    handled here.
+    handled here.  Writes are queued and committed in batches by a
+    background thread, so recording never blocks on disk I/O.
     """
 
     def __init__(self, config: TraceboardConfig | None = None):
         self.config = config or TraceboardConfig()
+        self._enabled = self.config.enabled
         self._db = SyncDatabase(self.config.db_path)
-        self._db.connect()
-        self._lock = threading.Lock()
+        if self._enabled:
+            self._db.connect()
+            self._writer = BackgroundWriter(self._db, self.config.batch_size)
 
     # ── Public helpers for subclasses ──────────────────────────────────
 
     @staticmethod
     def _generate_id(prefix: str = "tb") -> str:
-        return f"{prefix}_{uuid.uuid4().hex[:16]}"
+        # 64 random bits, same width as the previous truncated uuid4 hex,
+        # without building a UUID object per call
+        return f"{prefix}_{os.urandom(8).hex()}"
+
+    def _track_pending(self, pending: dict[Any, Any], key: Any, ctx: Any) -> None:
+        """Remember state for an in-flight call until its end callback.
+
+        Calls whose end callback never fires (errors swallowed upstream,
+        abandoned streams) would otherwise pile up for the life of the
+        process, so past ``config.max_pending_runs`` the oldest is dropped.
+        """
+        pending[key] = ctx
+        if len(pending) > self.config.max_pending_runs:
+            # Dicts keep insertion order, so the first key is the oldest
+            stale = next(iter(pending))
+            pending.pop(stale, None)
+            logger.warning(
+                "TraceBoard: dropped unfinished call %s; over %d calls pending",
+                stale,
+                self.config.max_pending_runs,
+            )
 
     def record_llm_start(
         self,
@@ -60,16 +90,20 @@ class BaseTracer:
         """
         trace_id = trace_id or self._generate_id("trace")
         span_id = span_id or self._generate_id("span")
+        if not self._enabled:
+            return trace_id, span_id
         now = time.time()
 
-        trace = TraceRecord(
+        # Every field is already the right type; skip Pydantic validation
+        trace = TraceRecord.model_construct(
             trace_id=trace_id,
             workflow_name=workflow_name,
             started_at=now,
             status=TraceStatus.RUNNING,
-            metadata=metadata or {},
+            # Written later on the writer thread, so snapshot the caller's dict
+            metadata=copy.deepcopy(metadata) if metadata else {},
         )
-        span = SpanRecord(
+        span = SpanRecord.model_construct(
             span_id=span_id,
             trace_id=trace_id,
             span_type=SpanType.GENERATION,
@@ -78,9 +112,8 @@ class BaseTracer:
         )
 
         try:
-            with self._lock:
-                self._db.insert_trace(trace)
-                self._db.insert_span(span)
+            self._writer.submit(partial(self._db.insert_trace, trace))
+            self._writer.submit(partial(self._db.insert_span, span))
         except Exception:
             logger.exception("TraceBoard: error in record_llm_start")
 
@@ -99,8 +132,12 @@ class BaseTracer:
         extra_data: dict[str, Any] | None = None,
     ) -> None:
         """Record the completion of an LLM call."""
+        if not self._enabled:
+            return
         now = time.time()
         total_tokens = input_tokens + output_tokens
+        if type(model) is str:
+            model = sys.intern(model)
         cost = calculate_cost(model, input_tokens, output_tokens) if model else 0.0
 
         span_data: dict[str, Any] = {
@@ -110,30 +147,33 @@ class BaseTracer:
             "output_tokens": output_tokens,
         }
         if response_text is not None:
-            span_data["output"] = (
-                response_text[:2000] if len(response_text) > 2000 else response_text
-            )
+            span_data["output"] = response_text[:MAX_TEXT_CHARS]
+        # The writer thread encodes these later; copy so the caller can
+        # keep mutating its own dicts.
         if extra_data:
-            span_data.update(extra_data)
+            span_data.update(copy.deepcopy(extra_data))
+        if error:
+            error = copy.deepcopy(error)
 
         status = TraceStatus.ERROR.value if error else TraceStatus.COMPLETED.value
 
         try:
-            with self._lock:
-                self._db.update_span_end(
-                    span_id=span_id,
-                    ended_at=now,
-                    span_data=span_data,
-                    error=error,
-                    cost=cost,
-                )
-                self._db.update_trace_end(
-                    trace_id=trace_id,
-                    ended_at=now,
-                    status=status,
-                    total_tokens=total_tokens,
-                    total_cost=cost,
-                )
+            self._writer.submit(partial(
+                self._db.update_span_end,
+                span_id=span_id,
+                ended_at=now,
+                span_data=span_data,
+                error=error,
+                cost=cost,
+            ))
+            self._writer.submit(partial(
+                self._db.update_trace_end,
+                trace_id=trace_id,
+                ended_at=now,
+                status=status,
+                total_tokens=total_tokens,
+                total_cost=cost,
+            ))
         except Exception:
             logger.exception("TraceBoard: error in record_llm_end")
 
@@ -150,11 +190,13 @@ class BaseTracer:
     ) -> str:
         """Record a tool/function call as a child span."""
         span_id = self._generate_id("span")
-        now = time.time()
-        start = started_at or now
-        end = ended_at or now
+        if not self._enabled:
+            return span_id
+        # One clock read covers both defaults
+        end = ended_at or time.time()
+        start = started_at or end
 
-        span = SpanRecord(
+        span = SpanRecord.model_construct(
             span_id=span_id,
             trace_id=trace_id,
             parent_id=parent_span_id,
@@ -165,23 +207,33 @@ class BaseTracer:
             span_data={
                 "type": SpanType.FUNCTION.value,
                 "name": tool_name,
-                "input": tool_input[:2000] if len(tool_input) > 2000 else tool_input,
-                "output": tool_output[:2000] if len(tool_output) > 2000 else tool_output,
+                "input": tool_input[:MAX_TEXT_CHARS],
+                "output": tool_output[:MAX_TEXT_CHARS],
             },
         )
 
         try:
-            with self._lock:
-                self._db.insert_span(span)
+            self._writer.submit(partial(self._db.insert_span, span))
         except Exception:
             logger.exception("TraceBoard: error in record_tool_call")
 
         return span_id
 
+    def flush(self) -> None:
+        """Block until every recorded trace and span is committed."""
+        if not self._enabled:
+            return
+        try:
+            self._writer.flush()
+        except Exception:
+            logger.exception("TraceBoard: error in flush")
+
     def shutdown(self) -> None:
-        """Close the database connection."""
+        """Write everything still queued and close the database connection."""
+        if not self._enabled:
+            return
         try:
-            with self._lock:
-                self._db.close()
+            self._writer.close()
+            self._db.close()
         except Exception:
             logger.exception("TraceBoard: error during shutdown")
@@ -0,0 +1,125 @@
+"""Background writer thread shared by the SDK adapters.
+
+Tracing callbacks run on the caller's thread (the agent loop, an HTTP
+hook, a LangChain callback).  Instead of touching SQLite there, they
+hand ``partial`` write operations to a :class:`BackgroundWriter`, whose
+thread applies them in batched transactions.
+"""
+
+from __future__ import annotations
+
+import atexit
+import logging
+import queue
+import threading
+from functools import partial
+from itertools import groupby
+from operator import attrgetter
+from typing import Any
+
+from traceboard.server.database import SyncDatabase
+
+logger = logging.getLogger("traceboard")
+
+# Tells the writer thread to exit once everything queued before it is written
+_STOP = object()
+
+
+class BackgroundWriter:
+    """Applies queued :class:`SyncDatabase` writes on a dedicated thread.
+
+    The thread drains whatever is already queued, up to ``batch_size``
+    operations, and commits it in one transaction; consecutive span
+    inserts, and consecutive span completions, each collapse into a
+    single ``executemany``.  Writes are applied in submission order.
+    If the batch fails, it is replayed one operation at a time so only
+    the failing operations are lost.
+    """
+
+    def __init__(self, db: SyncDatabase, batch_size: int = 50):
+        self._db = db
+        self._batch_size = batch_size
+        self._queue: queue.SimpleQueue[Any] = queue.SimpleQueue()
+        self._closed = False
+        self._thread = threading.Thread(
+            target=self._drain, name="traceboard-writer", daemon=True
+        )
+        self._thread.start()
+        # Don't lose queued writes when a script exits without shutdown()
+        atexit.register(self.close)
+
+    @property
+    def ident(self) -> int | None:
+        """Thread identifier of the writer thread."""
+        return self._thread.ident
+
+    def submit(self, op: partial[None]) -> None:
+        """Queue a write; never blocks on the database."""
+        if self._closed:
+            logger.warning("TraceBoard: dropping write submitted after the writer closed")
+            return
+        self._queue.put(op)
+
+    def flush(self) -> None:
+        """Block until every write submitted so far is committed."""
+        if self._thread.is_alive():
+            done = threading.Event()
+            self._queue.put(done)
+            done.wait()
+
+    def close(self) -> None:
+        """Write everything still queued, then stop the thread."""
+        self._closed = True
+        atexit.unregister(self.close)
+        if self._thread.is_alive():
+            self._queue.put(_STOP)
+            self._thread.join()
+
+    def _drain(self) -> None:
+        """Writer thread loop: commit queued writes in batches until stopped."""
+        running = True
+        while running:
+            item = self._queue.get()
+            batch: list[partial[None]] = []
+            flushed: list[threading.Event] = []
+            # Take whatever else is already queued, up to one batch
+            while True:
+                if item is _STOP:
+                    running = False
+                    break
+                if isinstance(item, threading.Event):
+                    flushed.append(item)
+                else:
+                    batch.append(item)
+                if len(batch) >= self._batch_size:
+                    break
+                try:
+                    item = self._queue.get_nowait()
+                except queue.Empty:
+                    break
+            self._write_batch(batch)
+            for done in flushed:
+                done.set()
+
+    def _write_batch(self, batch: list[partial[None]]) -> None:
+        """Apply queued writes in order, in one transaction."""
+        if not batch:
+            return
+        try:
+            with self._db.transaction():
+                for func, ops in groupby(batch, key=attrgetter("func")):
+                    if func == self._db.insert_span:
+                        self._db.insert_spans([op.args[0] for op in ops])
+                    elif func == self._db.update_span_end:
+                        self._db.update_span_ends([op.keywords for op in ops])
+                    else:
+                        for op in ops:
+                            op()
+        except Exception:
+            # The transaction was rolled back; isolate the bad operations
+            for op in batch:
+                try:
+                    with self._db.transaction():
+                        op()
+                except Exception:
+                    logger.exception("TraceBoard: failed to write %s", op.func.__name__)
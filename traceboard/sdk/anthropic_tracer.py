@@ -16,24 +16,35 @@ Usage::
 
 from __future__ import annotations
 
-import json
 import logging
-import time
+from types import MappingProxyType
 from typing import Any
 
-from traceboard.config import TraceboardConfig
+from traceboard import _json
 from traceboard.sdk._base import BaseTracer
 
+try:
+    import anthropic
+    import httpx
+except ImportError:  # checked when a client is instrumented
+    anthropic = None  # type: ignore[assignment]
+    httpx = None  # type: ignore[assignment]
+
 logger = logging.getLogger("traceboard")
 
+# Messages API endpoint; batches and count_tokens live under it and are skipped
+_MESSAGES_PATH_SUFFIX = "/messages"
+
+# Key under which the trace context rides on ``httpx.Request.extensions``
+_CTX_KEY = "traceboard_ctx"
+
+# Shared read-only default for absent ``usage`` / ``error`` objects
+_EMPTY: MappingProxyType[str, Any] = MappingProxyType({})
+
 
 class AnthropicTracer(BaseTracer):
     """Traces Anthropic SDK calls via httpx event hooks."""
 
-    def __init__(self, config: TraceboardConfig | None = None):
-        super().__init__(config)
-        self._pending: dict[int, dict[str, Any]] = {}
-
     def instrument(self, client: Any | None = None) -> Any:
         """Instrument an Anthropic client, or create a new instrumented one.
 
@@ -45,10 +56,7 @@ class AnthropicTracer(BaseTracer):
         Returns:
             The instrumented client.
         """
-        try:
-            import anthropic
-            import httpx
-        except ImportError:
+        if anthropic is None or httpx is None:
             raise ImportError(
                 "The 'anthropic' package is required for Anthropic tracing. "
                 "Install it with: pip install traceboard[anthropic]"
@@ -70,10 +78,7 @@ class AnthropicTracer(BaseTracer):
 
     def instrument_async(self, client: Any | None = None) -> Any:
         """Instrument an async Anthropic client."""
-        try:
-            import anthropic
-            import httpx
-        except ImportError:
+        if anthropic is None or httpx is None:
             raise ImportError(
                 "The 'anthropic' package is required. "
                 "Install with: pip install traceboard[anthropic]"
@@ -95,33 +100,32 @@ class AnthropicTracer(BaseTracer):
 
     def _on_request(self, request: Any) -> None:
         """Sync hook: called before request is sent."""
-        if "/messages" not in str(request.url):
+        if not self._enabled or not request.url.path.endswith(_MESSAGES_PATH_SUFFIX):
             return
         try:
-            body = json.loads(request.content) if request.content else {}
+            body = _json.loads(request.content) if request.content else {}
             model = body.get("model", "claude")
             trace_id, span_id = self.record_llm_start(
                 workflow_name=f"Anthropic: {model}",
                 model=model,
                 metadata={"provider": "anthropic", "sdk": "anthropic-python"},
             )
-            self._pending[id(request)] = {
+            request.extensions[_CTX_KEY] = {
                 "trace_id": trace_id,
                 "span_id": span_id,
                 "model": model,
-                "started_at": time.time(),
             }
         except Exception:
             logger.debug("TraceBoard: failed to intercept Anthropic request")
 
     def _on_response(self, response: Any) -> None:
         """Sync hook: called after response is received."""
-        ctx = self._pending.pop(id(response.request), None)
+        ctx = response.request.extensions.pop(_CTX_KEY, None)
         if ctx is None:
             return
         try:
             response.read()
-            data = json.loads(response.content)
+            data = _json.loads(response.content)
             self._finish(ctx, data)
         except Exception:
             logger.debug("TraceBoard: failed to parse Anthropic response")
@@ -129,32 +133,31 @@ class AnthropicTracer(BaseTracer):
     # ── httpx async hooks ─────────────────────────────────────────────
 
     async def _on_async_request(self, request: Any) -> None:
-        if "/messages" not in str(request.url):
+        if not self._enabled or not request.url.path.endswith(_MESSAGES_PATH_SUFFIX):
             return
         try:
-            body = json.loads(request.content) if request.content else {}
+            body = _json.loads(request.content) if request.content else {}
             model = body.get("model", "claude")
             trace_id, span_id = self.record_llm_start(
                 workflow_name=f"Anthropic: {model}",
                 model=model,
                 metadata={"provider": "anthropic", "sdk": "anthropic-python"},
             )
-            self._pending[id(request)] = {
+            request.extensions[_CTX_KEY] = {
                 "trace_id": trace_id,
                 "span_id": span_id,
                 "model": model,
-                "started_at": time.time(),
             }
         except Exception:
             logger.debug("TraceBoard: failed to intercept async Anthropic request")
 
     async def _on_async_response(self, response: Any) -> None:
-        ctx = self._pending.pop(id(response.request), None)
+        ctx = response.request.extensions.pop(_CTX_KEY, None)
         if ctx is None:
             return
         try:
             await response.aread()
-            data = json.loads(response.content)
+            data = _json.loads(response.content)
             self._finish(ctx, data)
         except Exception:
             logger.debug("TraceBoard: failed to parse async Anthropic response")
@@ -163,22 +166,24 @@ class AnthropicTracer(BaseTracer):
 
     def _finish(self, ctx: dict[str, Any], data: dict[str, Any]) -> None:
         """Extract usage from response and record LLM end."""
-        usage = data.get("usage", {})
+        usage = data.get("usage") or _EMPTY
         input_tokens = usage.get("input_tokens", 0)
         output_tokens = usage.get("output_tokens", 0)
         model = data.get("model", ctx.get("model", "claude"))
 
         # Extract response text
-        response_text = ""
-        for block in data.get("content", []):
-            if isinstance(block, dict) and block.get("type") == "text":
-                response_text += block.get("text", "")
+        response_text = "".join(
+            block.get("text", "")
+            for block in data.get("content") or ()
+            if isinstance(block, dict) and block.get("type") == "text"
+        )
 
         error_info = None
         if data.get("type") == "error":
+            error = data.get("error") or _EMPTY
             error_info = {
-                "type": data.get("error", {}).get("type", "api_error"),
-                "message": data.get("error", {}).get("message", "Unknown error"),
+                "type": error.get("type", "api_error"),
+                "message": error.get("message", "Unknown error"),
             }
 
         self.record_llm_end(
@@ -210,9 +215,7 @@ class AnthropicTracer(BaseTracer):
             return
 
         # Detect sync vs async
-        import httpx as _httpx
-
-        if isinstance(http, _httpx.AsyncClient):
+        if httpx is not None and isinstance(http, httpx.AsyncClient):
             hooks.setdefault("request", []).append(self._on_async_request)
             hooks.setdefault("response", []).append(self._on_async_response)
         else:
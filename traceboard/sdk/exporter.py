@@ -9,11 +9,85 @@ from __future__ import annotations
 
 import csv
 import io
-import json
 import sqlite3
+from collections import deque
+from collections.abc import Iterator
 from datetime import datetime, timezone
+from functools import lru_cache
 from pathlib import Path
-from typing import Any
+from typing import Any, BinaryIO, TextIO
+
+from traceboard import _json
+from traceboard.server.database import EXPORT_CHUNK_SIZE, SPAN_COLUMNS, take_trace_spans
+
+# Read-side tuning for export scans. Journal mode is left to the writer
+# (Database sets WAL); export connections are read-only.
+READ_PRAGMAS: tuple[str, ...] = (
+    "PRAGMA query_only=ON",
+    "PRAGMA busy_timeout=5000",
+    "PRAGMA cache_size=-20000",
+    "PRAGMA mmap_size=268435456",
+    "PRAGMA temp_store=MEMORY",
+)
+
+# Export files are written sequentially; a large buffer keeps the number
+# of write() syscalls low for big databases.
+_WRITE_BUFFER = 1 << 20
+
+TRACE_CSV_COLUMNS = (
+    "trace_id",
+    "workflow_name",
+    "group_id",
+    "started_at",
+    "ended_at",
+    "status",
+    "total_tokens",
+    "total_cost",
+    "duration_s",
+)
+
+SPAN_CSV_COLUMNS = (
+    "span_id",
+    "trace_id",
+    "parent_id",
+    "span_type",
+    "name",
+    "started_at",
+    "ended_at",
+    "cost",
+    "duration_s",
+    "model",
+    "input_tokens",
+    "output_tokens",
+    "error",
+)
+
+# CSV rows are shaped entirely in SQL, so the cursor feeds csv.writer
+# directly. NULLs become empty cells.
+TRACE_CSV_SQL = """
+    SELECT trace_id, workflow_name, group_id, started_at, ended_at, status,
+           total_tokens, total_cost,
+           CASE WHEN ended_at THEN round(ended_at - started_at, 3) END
+    FROM traces {where}
+    ORDER BY started_at DESC
+"""
+
+SPAN_CSV_SQL = """
+    SELECT span_id, trace_id, parent_id, span_type, name, started_at, ended_at,
+           cost,
+           CASE WHEN ended_at THEN round(ended_at - started_at, 3) END,
+           json_extract(data, '$.model'),
+           json_extract(data, '$.input_tokens'),
+           json_extract(data, '$.output_tokens'),
+           error
+    FROM (
+        SELECT *,
+               CASE WHEN typeof(span_data) = 'blob' THEN span_json(span_data)
+                    WHEN json_valid(span_data) THEN span_data END AS data
+        FROM spans {where}
+    )
+    ORDER BY started_at ASC
+"""
 
 
 class TraceExporter:
@@ -38,13 +112,27 @@ class TraceExporter:
 
     def __init__(self, db_path: str = "./traceboard.db"):
         self.db_path = db_path
+        self._db_found = False
 
     def _connect(self) -> sqlite3.Connection:
         """Open a read-only connection to the database."""
-        if not Path(self.db_path).exists():
-            raise FileNotFoundError(f"Database not found: {self.db_path}")
-        conn = sqlite3.connect(self.db_path)
+        # Only a positive result is cached: a missing file is re-checked on
+        # every call so the exporter works once the database is created.
+        if not self._db_found:
+            if not Path(self.db_path).exists():
+                raise FileNotFoundError(f"Database not found: {self.db_path}")
+            self._db_found = True
+        # Read-only: exporting never takes a write lock or blocks the SDK writer
+        uri = f"{Path(self.db_path).resolve().as_uri()}?mode=ro"
+        conn = sqlite3.connect(uri, uri=True)
         conn.row_factory = sqlite3.Row
+        for pragma in READ_PRAGMAS:
+            conn.execute(pragma)
+        # Compressed span_data (see _json.pack) is inflated for json_extract;
+        # the one-entry cache covers the repeated calls within a row.
+        conn.create_function(
+            "span_json", 1, lru_cache(maxsize=1)(_json.unpack_text), deterministic=True
+        )
         return conn
 
     # ── JSON Export ────────────────────────────────────────────────────
@@ -55,6 +143,7 @@ class TraceExporter:
         *,
         pretty: bool = True,
         trace_ids: list[str] | None = None,
+        stream: bool = False,
     ) -> dict[str, Any]:
         """Export traces and spans as JSON.
 
@@ -63,26 +152,54 @@ class TraceExporter:
             pretty: Whether to pretty-print the JSON output.
             trace_ids: Optional list of trace IDs to export.
                 If None, exports all traces.
+            stream: With ``output_path``, write traces to the file one at
+                a time instead of building the whole export in memory.
 
         Returns:
-            The exported data as a dictionary.
+            The exported data as a dictionary.  With ``stream=True`` it
+            holds only the header fields (``version``, ``exported_at``,
+            ``trace_count``).
         """
         conn = self._connect()
         try:
-            data = self._build_export_data(conn, trace_ids)
+            if not output_path:
+                return self._build_export_data(conn, trace_ids)
+            path = Path(output_path)
+            path.parent.mkdir(parents=True, exist_ok=True)
+            with path.open("wb", buffering=_WRITE_BUFFER) as f:
+                if stream:
+                    return self._write_json(conn, f, trace_ids, pretty=pretty)
+                data = self._build_export_data(conn, trace_ids)
+                f.write(_json.dumpb(data, pretty=pretty))
+                return data
         finally:
             conn.close()
 
-        if output_path:
-            path = Path(output_path)
-            path.parent.mkdir(parents=True, exist_ok=True)
-            indent = 2 if pretty else None
-            path.write_text(
-                json.dumps(data, indent=indent, ensure_ascii=False, default=str),
-                encoding="utf-8",
-            )
+    def export_json_stream(
+        self,
+        out: BinaryIO,
+        *,
+        pretty: bool = True,
+        trace_ids: list[str] | None = None,
+    ) -> dict[str, Any]:
+        """Stream the JSON export to a binary file object.
+
+        Traces are encoded and written one at a time, so memory use does
+        not grow with the size of the database.
+
+        Args:
+            out: Binary stream to write to (e.g. ``sys.stdout.buffer``).
+            pretty: Whether to pretty-print the JSON output.
+            trace_ids: Optional list of trace IDs to export.
 
-        return data
+        Returns:
+            The header fields (``version``, ``exported_at``, ``trace_count``).
+        """
+        conn = self._connect()
+        try:
+            return self._write_json(conn, out, trace_ids, pretty=pretty)
+        finally:
+            conn.close()
 
     # ── CSV Export ─────────────────────────────────────────────────────
 
@@ -92,6 +209,7 @@ class TraceExporter:
         *,
         trace_ids: list[str] | None = None,
         include_spans: bool = True,
+        stream: bool = False,
     ) -> str:
         """Export traces (and optionally spans) as CSV.
 
@@ -105,29 +223,40 @@ class TraceExporter:
             output_path: If provided, write CSV to this file path.
             trace_ids: Optional list of trace IDs to export.
             include_spans: Whether to also export spans (default True).
+            stream: With ``output_path``, write rows straight to disk
+                instead of also building the traces CSV in memory.
 
         Returns:
-            The traces CSV content as a string.
+            The traces CSV content as a string, or an empty string with
+            ``stream=True``.
         """
         conn = self._connect()
         try:
-            traces_csv = self._traces_to_csv(conn, trace_ids)
-            spans_csv = ""
-            if include_spans:
-                spans_csv = self._spans_to_csv(conn, trace_ids)
-        finally:
-            conn.close()
+            traces_csv = ""
+            if not (output_path and stream):
+                buf = io.StringIO()
+                self._write_traces_csv(conn, trace_ids, buf)
+                traces_csv = buf.getvalue()
+            if not output_path:
+                return traces_csv
 
-        if output_path:
             path = Path(output_path)
             path.parent.mkdir(parents=True, exist_ok=True)
-            path.write_text(traces_csv, encoding="utf-8")
+            with path.open("w", buffering=_WRITE_BUFFER, encoding="utf-8", newline="") as f:
+                if stream:
+                    self._write_traces_csv(conn, trace_ids, f)
+                else:
+                    f.write(traces_csv)
 
-            if include_spans and spans_csv:
+            if include_spans:
                 spans_path = path.with_name(f"{path.stem}_spans{path.suffix}")
-                spans_path.write_text(spans_csv, encoding="utf-8")
-
-        return traces_csv
+                with spans_path.open(
+                    "w", buffering=_WRITE_BUFFER, encoding="utf-8", newline=""
+                ) as f:
+                    self._write_spans_csv(conn, trace_ids, f)
+            return traces_csv
+        finally:
+            conn.close()
 
     # ── Internal helpers ──────────────────────────────────────────────
 
@@ -137,146 +266,131 @@ class TraceExporter:
         trace_ids: list[str] | None,
     ) -> dict[str, Any]:
         """Build the full JSON export data structure."""
-        where, params = self._build_where(trace_ids)
+        traces = list(self._iter_traces(conn, trace_ids))
+        return {
+            "version": "1.0",
+            "exported_at": datetime.now(timezone.utc).isoformat(),
+            "trace_count": len(traces),
+            "traces": traces,
+        }
+
+    def _write_json(
+        self,
+        conn: sqlite3.Connection,
+        out: BinaryIO,
+        trace_ids: list[str] | None,
+        *,
+        pretty: bool,
+    ) -> dict[str, Any]:
+        """Stream the JSON export to ``out`` without holding all traces.
+
+        Produces the same document as ``_build_export_data()`` would,
+        except that ``trace_count`` is written after the traces array.
+        """
+        header: dict[str, Any] = {
+            "version": "1.0",
+            "exported_at": datetime.now(timezone.utc).isoformat(),
+        }
+        nl, pad, sep = (b"\n", b"  ", b": ") if pretty else (b"", b"", b":")
+
+        out.write(b"{" + nl)
+        for key, value in header.items():
+            out.write(pad + _json.dumpb(key) + sep + _json.dumpb(value) + b"," + nl)
+        out.write(pad + b'"traces"' + sep + b"[")
+
+        count = 0
+        for item in self._iter_traces(conn, trace_ids):
+            if count:
+                out.write(b",")
+            encoded = _json.dumpb(item, pretty=pretty)
+            if pretty:
+                encoded = nl + pad * 2 + encoded.replace(nl, nl + pad * 2)
+            out.write(encoded)
+            count += 1
+
+        out.write((nl + pad if count else b"") + b"]," + nl)
+        out.write(pad + b'"trace_count"' + sep + str(count).encode() + nl + b"}\n")
+
+        header["trace_count"] = count
+        return header
+
+    def _iter_traces(
+        self,
+        conn: sqlite3.Connection,
+        trace_ids: list[str] | None,
+    ) -> Iterator[dict[str, Any]]:
+        """Yield ``{"trace": ..., "spans": [...]}`` one trace at a time.
 
-        traces: list[dict[str, Any]] = []
-        for row in conn.execute(
-            f"SELECT * FROM traces {where} ORDER BY started_at DESC",
+        Spans are read by a single query sorted in the same trace order as
+        the traces cursor, so the two are merged in one pass (see
+        :func:`~traceboard.server.database.take_trace_spans`) instead of
+        issuing a spans query per trace.
+        """
+        where, params = self._build_where(trace_ids, column="t.trace_id")
+        order = "ORDER BY t.started_at DESC, t.trace_id"
+
+        trace_rows = conn.execute(f"SELECT t.* FROM traces t {where} {order}", params)
+        span_rows = conn.execute(
+            f"""SELECT {SPAN_COLUMNS} FROM spans s JOIN traces t ON t.trace_id = s.trace_id
+                {where} {order}, s.started_at ASC""",
             params,
-        ):
+        )
+        buffer: deque[sqlite3.Row] = deque()
+        more = True
+
+        for row in trace_rows:
             trace_data = dict(row)
-            trace_data["metadata"] = json.loads(trace_data.get("metadata") or "{}")
+            trace_data["metadata"] = _json.loads(trace_data.get("metadata") or "{}")
+            trace_id = trace_data["trace_id"]
 
             # Attach spans
+            rows: list[sqlite3.Row] = []
+            while take_trace_spans(buffer, trace_id, rows) and more:
+                chunk = span_rows.fetchmany(EXPORT_CHUNK_SIZE)
+                more = len(chunk) == EXPORT_CHUNK_SIZE
+                buffer.extend(chunk)
+
             spans: list[dict[str, Any]] = []
-            for span_row in conn.execute(
-                "SELECT * FROM spans WHERE trace_id = ? ORDER BY started_at ASC",
-                (trace_data["trace_id"],),
-            ):
+            for span_row in rows:
                 span = dict(span_row)
-                span["span_data"] = json.loads(span.get("span_data") or "{}")
+                span["span_data"] = _json.unpack(span.get("span_data") or "{}")
                 if span.get("error"):
-                    span["error"] = json.loads(span["error"])
+                    span["error"] = _json.loads(span["error"])
                 spans.append(span)
 
-            traces.append({"trace": trace_data, "spans": spans})
-
-        return {
-            "version": "1.0",
-            "exported_at": datetime.now(timezone.utc).isoformat(),
-            "trace_count": len(traces),
-            "traces": traces,
-        }
+            yield {"trace": trace_data, "spans": spans}
 
-    def _traces_to_csv(
+    def _write_traces_csv(
         self,
         conn: sqlite3.Connection,
         trace_ids: list[str] | None,
-    ) -> str:
-        """Convert traces to CSV format."""
+        out: TextIO,
+    ) -> None:
+        """Write traces to ``out`` in CSV format."""
         where, params = self._build_where(trace_ids)
-        buf = io.StringIO()
-        writer = csv.writer(buf)
-
-        writer.writerow([
-            "trace_id",
-            "workflow_name",
-            "group_id",
-            "started_at",
-            "ended_at",
-            "status",
-            "total_tokens",
-            "total_cost",
-            "duration_s",
-        ])
-
-        for row in conn.execute(
-            f"SELECT * FROM traces {where} ORDER BY started_at DESC",
-            params,
-        ):
-            started = row["started_at"]
-            ended = row["ended_at"]
-            duration = round(ended - started, 3) if ended else None
-            writer.writerow([
-                row["trace_id"],
-                row["workflow_name"],
-                row["group_id"] or "",
-                started,
-                ended or "",
-                row["status"],
-                row["total_tokens"],
-                row["total_cost"],
-                duration if duration is not None else "",
-            ])
-
-        return buf.getvalue()
-
-    def _spans_to_csv(
+        writer = csv.writer(out)
+        writer.writerow(TRACE_CSV_COLUMNS)
+        writer.writerows(conn.execute(TRACE_CSV_SQL.format(where=where), params))
+
+    def _write_spans_csv(
         self,
         conn: sqlite3.Connection,
         trace_ids: list[str] | None,
-    ) -> str:
-        """Convert spans to CSV format."""
+        out: TextIO,
+    ) -> None:
+        """Write spans to ``out`` in CSV format."""
         where, params = self._build_where(trace_ids)
-        buf = io.StringIO()
-        writer = csv.writer(buf)
-
-        writer.writerow([
-            "span_id",
-            "trace_id",
-            "parent_id",
-            "span_type",
-            "name",
-            "started_at",
-            "ended_at",
-            "cost",
-            "duration_s",
-            "model",
-            "input_tokens",
-            "output_tokens",
-            "error",
-        ])
-
-        for row in conn.execute(
-            f"SELECT * FROM spans {where} ORDER BY started_at ASC",
-            params,
-        ):
-            span_data = json.loads(row["span_data"] or "{}")
-            started = row["started_at"]
-            ended = row["ended_at"]
-            duration = round(ended - started, 3) if ended else None
-            error = row["error"]
-            error_str = ""
-            if error:
-                try:
-                    error_str = json.dumps(json.loads(error))
-                except (json.JSONDecodeError, TypeError):
-                    error_str = str(error)
-
-            writer.writerow([
-                row["span_id"],
-                row["trace_id"],
-                row["parent_id"] or "",
-                row["span_type"],
-                row["name"],
-                started,
-                ended or "",
-                row["cost"],
-                duration if duration is not None else "",
-                span_data.get("model", ""),
-                span_data.get("input_tokens", ""),
-                span_data.get("output_tokens", ""),
-                error_str,
-            ])
-
-        return buf.getvalue()
+        writer = csv.writer(out)
+        writer.writerow(SPAN_CSV_COLUMNS)
+        writer.writerows(conn.execute(SPAN_CSV_SQL.format(where=where), params))
 
     @staticmethod
     def _build_where(
         trace_ids: list[str] | None,
+        column: str = "trace_id",
     ) -> tuple[str, list[str]]:
         """Build a WHERE clause for optional trace ID filtering."""
         if not trace_ids:
             return "", []
         placeholders = ",".join("?" for _ in trace_ids)
-        return f"WHERE trace_id IN ({placeholders})", list(trace_ids)
+        return f"WHERE {column} IN ({placeholders})", list(trace_ids)
@@ -18,15 +18,29 @@ from __future__ import annotations
 
 import logging
 import time
+from dataclasses import dataclass
+from functools import lru_cache
 from typing import Any
 from uuid import UUID
 
 from traceboard.config import TraceboardConfig
-from traceboard.sdk._base import BaseTracer
+from traceboard.sdk._base import MAX_TEXT_CHARS, BaseTracer
 
 logger = logging.getLogger("traceboard")
 
 
+@dataclass(frozen=True, slots=True)
+class _RunCtx:
+    """State kept for a LangChain run between its start and end callbacks."""
+
+    trace_id: str | None = None
+    span_id: str | None = None
+    model: str = ""
+    tool_name: str | None = None
+    tool_input: str = ""
+    started_at: float | None = None
+
+
 class TraceBoardCallbackHandler(BaseTracer):
     """LangChain callback handler that writes traces to TraceBoard.
 
@@ -34,28 +48,18 @@ class TraceBoardCallbackHandler(BaseTracer):
     Pass an instance to LangChain via the ``callbacks`` parameter.
     """
 
-    # We lazily inherit from BaseCallbackHandler to avoid hard-importing
-    # langchain_core at module level (it's an optional dependency).
-
     def __init__(self, config: TraceboardConfig | None = None):
         super().__init__(config)
-        self._runs: dict[UUID, dict[str, Any]] = {}
-
-        # Dynamically inherit from BaseCallbackHandler so LangChain
-        # recognises this object as a valid handler.
-        try:
-            from langchain_core.callbacks import BaseCallbackHandler
-
-            # Mixin at instance level — makes isinstance() checks pass.
-            self.__class__ = type(
-                "TraceBoardCallbackHandler",
-                (TraceBoardCallbackHandler.__bases__[0], BaseCallbackHandler),
-                dict(TraceBoardCallbackHandler.__dict__),
-            )
-        except ImportError:
-            logger.debug(
-                "langchain_core not installed; handler works standalone"
-            )
+        # Keyed by ``run_id.int``: ints hash and compare in C, UUIDs don't
+        self._runs: dict[int, _RunCtx] = {}
+
+        # Swap in the cached BaseCallbackHandler mixin so LangChain
+        # recognises this object as a valid handler.  Subclasses are
+        # left alone.
+        if type(self) is TraceBoardCallbackHandler:
+            handler_cls = _langchain_handler_class()
+            if handler_cls is not None:
+                self.__class__ = handler_cls
 
     # ── LLM callbacks ─────────────────────────────────────────────────
 
@@ -85,12 +89,9 @@ class TraceBoardCallbackHandler(BaseTracer):
                 **(metadata or {}),
             },
         )
-        self._runs[run_id] = {
-            "trace_id": trace_id,
-            "span_id": span_id,
-            "model": model,
-            "started_at": time.time(),
-        }
+        self._track_pending(
+            self._runs, run_id.int, _RunCtx(trace_id=trace_id, span_id=span_id, model=model)
+        )
 
     def on_chat_model_start(
         self,
@@ -118,12 +119,9 @@ class TraceBoardCallbackHandler(BaseTracer):
                 **(metadata or {}),
             },
         )
-        self._runs[run_id] = {
-            "trace_id": trace_id,
-            "span_id": span_id,
-            "model": model,
-            "started_at": time.time(),
-        }
+        self._track_pending(
+            self._runs, run_id.int, _RunCtx(trace_id=trace_id, span_id=span_id, model=model)
+        )
 
     def on_llm_end(
         self,
@@ -134,14 +132,14 @@ class TraceBoardCallbackHandler(BaseTracer):
         **kwargs: Any,
     ) -> None:
         """Called when LLM finishes generating."""
-        ctx = self._runs.pop(run_id, None)
+        ctx = self._runs.pop(run_id.int, None)
         if ctx is None:
             return
 
         # Extract token usage
         input_tokens = 0
         output_tokens = 0
-        model = ctx["model"]
+        model = ctx.model
 
         llm_output = getattr(response, "llm_output", None) or {}
         token_usage = llm_output.get("token_usage", {})
@@ -150,28 +148,25 @@ class TraceBoardCallbackHandler(BaseTracer):
             output_tokens = token_usage.get("completion_tokens", 0) or 0
 
         # Also check response-level usage (newer LangChain versions)
-        if not input_tokens and hasattr(response, "usage_metadata"):
-            usage_meta = response.usage_metadata or {}
-            input_tokens = usage_meta.get("input_tokens", 0) or 0
-            output_tokens = usage_meta.get("output_tokens", 0) or 0
+        if not input_tokens:
+            usage_meta = getattr(response, "usage_metadata", None)
+            if usage_meta:
+                input_tokens = usage_meta.get("input_tokens", 0) or 0
+                output_tokens = usage_meta.get("output_tokens", 0) or 0
 
         # Extract model name from output if available
-        if llm_output.get("model_name"):
-            model = llm_output["model_name"]
+        model = llm_output.get("model_name") or model
 
         # Extract response text
-        response_text = ""
-        generations = getattr(response, "generations", [])
-        if generations:
-            for gen_list in generations:
-                for gen in gen_list:
-                    text = getattr(gen, "text", "") or ""
-                    if text:
-                        response_text += text
+        response_text = "".join(
+            getattr(gen, "text", "") or ""
+            for gen_list in getattr(response, "generations", None) or ()
+            for gen in gen_list
+        )
 
         self.record_llm_end(
-            trace_id=ctx["trace_id"],
-            span_id=ctx["span_id"],
+            trace_id=ctx.trace_id,
+            span_id=ctx.span_id,
             model=model,
             input_tokens=input_tokens,
             output_tokens=output_tokens,
@@ -187,14 +182,14 @@ class TraceBoardCallbackHandler(BaseTracer):
         **kwargs: Any,
     ) -> None:
         """Called when LLM call errors."""
-        ctx = self._runs.pop(run_id, None)
+        ctx = self._runs.pop(run_id.int, None)
         if ctx is None:
             return
 
         self.record_llm_end(
-            trace_id=ctx["trace_id"],
-            span_id=ctx["span_id"],
-            model=ctx["model"],
+            trace_id=ctx.trace_id,
+            span_id=ctx.span_id,
+            model=ctx.model,
             error={"type": type(error).__name__, "message": str(error)},
         )
 
@@ -213,12 +208,11 @@ class TraceBoardCallbackHandler(BaseTracer):
     ) -> None:
         """Called when a tool starts running."""
         tool_name = serialized.get("name", "tool")
-        self._runs[run_id] = {
-            "tool_name": tool_name,
-            "tool_input": input_str,
-            "started_at": time.time(),
-            "parent_run_id": parent_run_id,
-        }
+        self._track_pending(
+            self._runs,
+            run_id.int,
+            _RunCtx(tool_name=tool_name, tool_input=input_str, started_at=time.time()),
+        )
 
     def on_tool_end(
         self,
@@ -229,24 +223,22 @@ class TraceBoardCallbackHandler(BaseTracer):
         **kwargs: Any,
     ) -> None:
         """Called when a tool finishes."""
-        ctx = self._runs.pop(run_id, None)
-        if ctx is None or "tool_name" not in ctx:
+        ctx = self._runs.pop(run_id.int, None)
+        if ctx is None or ctx.tool_name is None:
             return
 
         # Find parent trace_id
-        parent_ctx = self._runs.get(parent_run_id) if parent_run_id else None
-        trace_id = (parent_ctx or {}).get("trace_id")
-        if not trace_id:
+        parent_ctx = self._runs.get(parent_run_id.int) if parent_run_id else None
+        if parent_ctx is None or not parent_ctx.trace_id:
             return
 
         self.record_tool_call(
-            trace_id=trace_id,
-            tool_name=ctx["tool_name"],
-            tool_input=str(ctx.get("tool_input", "")),
-            tool_output=str(output)[:2000],
-            parent_span_id=(parent_ctx or {}).get("span_id"),
-            started_at=ctx.get("started_at"),
-            ended_at=time.time(),
+            trace_id=parent_ctx.trace_id,
+            tool_name=ctx.tool_name,
+            tool_input=str(ctx.tool_input),
+            tool_output=str(output)[:MAX_TEXT_CHARS],
+            parent_span_id=parent_ctx.span_id,
+            started_at=ctx.started_at,
         )
 
     def on_tool_error(
@@ -258,7 +250,7 @@ class TraceBoardCallbackHandler(BaseTracer):
         **kwargs: Any,
     ) -> None:
         """Called when a tool errors."""
-        self._runs.pop(run_id, None)
+        self._runs.pop(run_id.int, None)
 
     # ── Chain callbacks (lightweight tracking) ────────────────────────
 
@@ -272,3 +264,22 @@ class TraceBoardCallbackHandler(BaseTracer):
 
     def on_chain_error(self, error: BaseException, **kwargs: Any) -> None:
         pass
+
+
+@lru_cache(maxsize=None)
+def _langchain_handler_class() -> type[TraceBoardCallbackHandler] | None:
+    """Build the ``BaseCallbackHandler`` mixin once, or None without LangChain.
+
+    ``langchain_core`` is an optional dependency, so it is imported on
+    first handler construction rather than at module level.
+    """
+    try:
+        from langchain_core.callbacks import BaseCallbackHandler
+    except ImportError:
+        logger.debug("langchain_core not installed; handler works standalone")
+        return None
+    return type(
+        "TraceBoardCallbackHandler",
+        (TraceBoardCallbackHandler, BaseCallbackHandler),
+        {"__module__": __name__},
+    )
@@ -17,7 +17,9 @@ Usage::
 from __future__ import annotations
 
 import logging
+from dataclasses import dataclass
 from datetime import datetime
+from functools import lru_cache
 from typing import Any
 
 from traceboard.config import TraceboardConfig
@@ -26,6 +28,15 @@ from traceboard.sdk._base import BaseTracer
 logger = logging.getLogger("traceboard")
 
 
+@dataclass(frozen=True, slots=True)
+class _CallCtx:
+    """State kept for a LiteLLM call between its pre-call and result hooks."""
+
+    trace_id: str
+    span_id: str
+    model: str
+
+
 class TraceBoardLiteLLMLogger(BaseTracer):
     """LiteLLM custom logger that writes traces to TraceBoard.
 
@@ -37,20 +48,14 @@ class TraceBoardLiteLLMLogger(BaseTracer):
 
     def __init__(self, config: TraceboardConfig | None = None):
         super().__init__(config)
-        self._pending: dict[str, dict[str, Any]] = {}
+        self._pending: dict[str, _CallCtx] = {}
 
-        # Dynamically inherit from LiteLLM's CustomLogger so that
-        # litellm recognises this object.
-        try:
-            from litellm.integrations.custom_logger import CustomLogger
-
-            self.__class__ = type(
-                "TraceBoardLiteLLMLogger",
-                (TraceBoardLiteLLMLogger.__bases__[0], CustomLogger),
-                dict(TraceBoardLiteLLMLogger.__dict__),
-            )
-        except ImportError:
-            logger.debug("litellm not installed; logger works standalone")
+        # Swap in the cached CustomLogger mixin so that litellm
+        # recognises this object.  Subclasses are left alone.
+        if type(self) is TraceBoardLiteLLMLogger:
+            logger_cls = _litellm_logger_class()
+            if logger_cls is not None:
+                self.__class__ = logger_cls
 
     # ── Sync callbacks ────────────────────────────────────────────────
 
@@ -68,11 +73,9 @@ class TraceBoardLiteLLMLogger(BaseTracer):
                     "litellm_call_id": str(call_id),
                 },
             )
-            self._pending[str(call_id)] = {
-                "trace_id": trace_id,
-                "span_id": span_id,
-                "model": model,
-            }
+            self._track_pending(
+                self._pending, str(call_id), _CallCtx(trace_id, span_id, model)
+            )
         except Exception:
             logger.debug("TraceBoard: failed in log_pre_api_call")
 
@@ -130,11 +133,11 @@ class TraceBoardLiteLLMLogger(BaseTracer):
 
     # ── Shared logic ──────────────────────────────────────────────────
 
-    def _resolve_ctx(self, kwargs: dict[str, Any]) -> dict[str, Any] | None:
+    def _resolve_ctx(self, kwargs: dict[str, Any]) -> _CallCtx | None:
         """Find the pending context for this call."""
         call_id = str(kwargs.get("litellm_call_id", ""))
         ctx = self._pending.pop(call_id, None)
-        if ctx:
+        if ctx is not None:
             return ctx
 
         # Fallback: create trace on-the-fly if pre_api_call was missed
@@ -144,7 +147,7 @@ class TraceBoardLiteLLMLogger(BaseTracer):
             model=model,
             metadata={"provider": "litellm"},
         )
-        return {"trace_id": trace_id, "span_id": span_id, "model": model}
+        return _CallCtx(trace_id, span_id, model)
 
     def _handle_success(
         self,
@@ -165,13 +168,13 @@ class TraceBoardLiteLLMLogger(BaseTracer):
             output_tokens = logging_obj.get("completion_tokens", 0) or 0
 
             # Fallback: try response_obj.usage
-            if not input_tokens and hasattr(response_obj, "usage"):
-                usage = response_obj.usage
+            if not input_tokens:
+                usage = getattr(response_obj, "usage", None)
                 if usage:
                     input_tokens = getattr(usage, "prompt_tokens", 0) or 0
                     output_tokens = getattr(usage, "completion_tokens", 0) or 0
 
-            model = getattr(response_obj, "model", None) or ctx["model"]
+            model = getattr(response_obj, "model", None) or ctx.model
 
             # Extract response text
             response_text = ""
@@ -182,8 +185,8 @@ class TraceBoardLiteLLMLogger(BaseTracer):
                     response_text = getattr(msg, "content", "") or ""
 
             self.record_llm_end(
-                trace_id=ctx["trace_id"],
-                span_id=ctx["span_id"],
+                trace_id=ctx.trace_id,
+                span_id=ctx.span_id,
                 model=model,
                 input_tokens=input_tokens,
                 output_tokens=output_tokens,
@@ -211,10 +214,29 @@ class TraceBoardLiteLLMLogger(BaseTracer):
             }
 
             self.record_llm_end(
-                trace_id=ctx["trace_id"],
-                span_id=ctx["span_id"],
-                model=ctx["model"],
+                trace_id=ctx.trace_id,
+                span_id=ctx.span_id,
+                model=ctx.model,
                 error=error_info,
             )
         except Exception:
             logger.debug("TraceBoard: error in litellm failure handler")
+
+
+@lru_cache(maxsize=None)
+def _litellm_logger_class() -> type[TraceBoardLiteLLMLogger] | None:
+    """Build the ``CustomLogger`` mixin once, or None without LiteLLM.
+
+    ``litellm`` is an optional dependency, so it is imported on first
+    logger construction rather than at module level.
+    """
+    try:
+        from litellm.integrations.custom_logger import CustomLogger
+    except ImportError:
+        logger.debug("litellm not installed; logger works standalone")
+        return None
+    return type(
+        "TraceBoardLiteLLMLogger",
+        (TraceBoardLiteLLMLogger, CustomLogger),
+        {"__module__": __name__},
+    )
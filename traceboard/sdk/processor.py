@@ -8,19 +8,53 @@ and thread-safe, as required by the TracingProcessor interface.
 from __future__ import annotations
 
 import logging
+import sys
 import threading
 import time
+import zlib
+from dataclasses import dataclass, field
+from functools import lru_cache, partial
 from typing import Any
 
 from agents.tracing.processor_interface import TracingProcessor
 
 from traceboard.config import TraceboardConfig
 from traceboard.cost import calculate_cost
+from traceboard.sdk._writer import BackgroundWriter
 from traceboard.server.database import SyncDatabase
 from traceboard.server.models import SpanRecord, SpanType, TraceRecord, TraceStatus
 
 logger = logging.getLogger("traceboard")
 
+# span_data attributes stored for each known span type; other types
+# capture every public attribute
+_SPAN_DATA_ATTRS: dict[SpanType, tuple[str, ...]] = {
+    SpanType.GENERATION: (
+        "model",
+        "model_config",
+        "input",
+        "output",
+        "input_tokens",
+        "output_tokens",
+    ),
+    SpanType.FUNCTION: ("name", "input", "output"),
+    SpanType.AGENT: ("name", "handoffs", "tools", "output_type"),
+    SpanType.HANDOFF: ("from_agent", "to_agent"),
+    SpanType.GUARDRAIL: ("name", "triggered"),
+}
+
+# Number of locks the per-trace token/cost aggregates are striped across
+_LOCK_STRIPES = 16
+
+# Trace ids hash into this many buckets for the sampling decision
+_SAMPLE_BUCKETS = 1 << 16
+
+
+def _sample_bucket(trace_id: str) -> int:
+    """Bucket a trace id with CRC-32, which unlike ``hash()`` is not salted
+    per process, so every process makes the same sampling decision."""
+    return zlib.crc32(trace_id.encode()) % _SAMPLE_BUCKETS
+
 # Map OpenAI Agents SDK span data class names to our SpanType enum
 _SPAN_TYPE_MAP: dict[str, SpanType] = {
     "AgentSpanData": SpanType.AGENT,
@@ -35,22 +69,41 @@ _SPAN_TYPE_MAP: dict[str, SpanType] = {
 }
 
 
+@dataclass(slots=True)
+class _UnsampledTrace:
+    """An unsampled trace held back in case one of its spans fails."""
+
+    record: TraceRecord
+    # Spans started but not yet ended, written if the trace is promoted
+    open_spans: dict[str, SpanRecord] = field(default_factory=dict)
+
+
 class TraceBoardProcessor(TracingProcessor):
     """Captures OpenAI Agents SDK traces/spans and writes to local SQLite.
 
-    Thread-safe. All callback methods are non-blocking (writes happen
-    immediately via synchronous SQLite with WAL mode).
+    Thread-safe. Callbacks only enqueue writes; a dedicated writer thread
+    drains the queue and commits up to ``config.batch_size`` writes per
+    transaction, so SQLite latency never stalls the agent loop.
     """
 
     def __init__(self, config: TraceboardConfig | None = None):
         self.config = config or TraceboardConfig()
         self._db = SyncDatabase(self.config.db_path)
         self._db.connect()
-        self._lock = threading.Lock()
 
-        # Track token totals per trace for cost aggregation
-        self._trace_tokens: dict[str, dict[str, int]] = {}
+        # DB writes, applied in order by the writer thread
+        self._writer = BackgroundWriter(self._db, self.config.batch_size)
+
+        # Track token totals per trace for cost aggregation, guarded by
+        # locks striped by trace id so concurrent traces don't contend
+        self._trace_tokens: dict[str, int] = {}
         self._trace_costs: dict[str, float] = {}
+        self._stripes = tuple(threading.Lock() for _ in range(_LOCK_STRIPES))
+
+        # Head sampling: traces hashing at or above the cutoff are not
+        # written unless one of their spans fails
+        self._sample_cutoff = int(self.config.sample_rate * _SAMPLE_BUCKETS)
+        self._unsampled: dict[str, _UnsampledTrace] = {}
 
         logger.info(
             "TraceBoard initialized — traces will be saved to %s",
@@ -67,21 +120,33 @@ class TraceBoardProcessor(TracingProcessor):
                 trace, "workflow_name", "Agent workflow"
             )
             group_id = getattr(trace, "group_id", None)
-            metadata = getattr(trace, "metadata", None) or {}
+            metadata = getattr(trace, "metadata", None)
+            # Shallow copy: the writer thread encodes it after this returns
+            metadata = dict(metadata) if metadata and isinstance(metadata, dict) else {}
 
-            record = TraceRecord(
+            # Fields come from the SDK already typed; skip re-validation
+            record = TraceRecord.model_construct(
                 trace_id=trace_id,
                 workflow_name=workflow_name,
                 group_id=group_id,
                 started_at=time.time(),
                 status=TraceStatus.RUNNING,
-                metadata=metadata if isinstance(metadata, dict) else {},
+                metadata=metadata,
             )
 
-            with self._lock:
-                self._trace_tokens[trace_id] = {"input": 0, "output": 0}
+            if (
+                self._sample_cutoff < _SAMPLE_BUCKETS
+                and _sample_bucket(trace_id) >= self._sample_cutoff
+            ):
+                # Kept in memory in case the trace needs promoting
+                self._unsampled[trace_id] = _UnsampledTrace(record)
+                return
+
+            with self._lock_for(trace_id):
+                self._trace_tokens[trace_id] = 0
                 self._trace_costs[trace_id] = 0.0
-                self._db.insert_trace(record)
+
+            self._writer.submit(partial(self._db.insert_trace, record))
 
         except Exception:
             logger.exception("TraceBoard: error in on_trace_start")
@@ -90,19 +155,21 @@ class TraceBoardProcessor(TracingProcessor):
         """Called when a trace completes."""
         try:
             trace_id = trace.trace_id
+            if self._unsampled and self._unsampled.pop(trace_id, None) is not None:
+                return
 
-            with self._lock:
-                tokens = self._trace_tokens.pop(trace_id, {"input": 0, "output": 0})
+            with self._lock_for(trace_id):
+                total_tokens = self._trace_tokens.pop(trace_id, 0)
                 total_cost = self._trace_costs.pop(trace_id, 0.0)
-                total_tokens = tokens["input"] + tokens["output"]
-
-                self._db.update_trace_end(
-                    trace_id=trace_id,
-                    ended_at=time.time(),
-                    status=TraceStatus.COMPLETED.value,
-                    total_tokens=total_tokens,
-                    total_cost=total_cost,
-                )
+
+            self._writer.submit(partial(
+                self._db.update_trace_end,
+                trace_id=trace_id,
+                ended_at=time.time(),
+                status=TraceStatus.COMPLETED.value,
+                total_tokens=total_tokens,
+                total_cost=total_cost,
+            ))
 
         except Exception:
             logger.exception("TraceBoard: error in on_trace_end")
@@ -114,7 +181,8 @@ class TraceBoardProcessor(TracingProcessor):
             span_type = self._resolve_span_type(span_data_obj)
             name = self._resolve_span_name(span, span_data_obj, span_type)
 
-            record = SpanRecord(
+            # Fields come from the SDK already typed; skip re-validation
+            record = SpanRecord.model_construct(
                 span_id=span.span_id,
                 trace_id=span.trace_id,
                 parent_id=getattr(span, "parent_id", None),
@@ -123,8 +191,9 @@ class TraceBoardProcessor(TracingProcessor):
                 started_at=time.time(),
             )
 
-            with self._lock:
-                self._db.insert_span(record)
+            if self._unsampled and self._hold_span(record):
+                return
+            self._writer.submit(partial(self._db.insert_span, record))
 
         except Exception:
             logger.exception("TraceBoard: error in on_span_start")
@@ -136,48 +205,109 @@ class TraceBoardProcessor(TracingProcessor):
             span_type = self._resolve_span_type(span_data_obj)
             span_data = self._extract_span_data(span_data_obj, span_type)
             error = self._extract_error(span)
+            trace_id = span.trace_id
+            if self._unsampled and trace_id in self._unsampled:
+                if error is None:
+                    if self._release_span(trace_id, span.span_id):
+                        return
+                else:
+                    # Failures are always kept: record the trace from here on
+                    self._promote_trace(trace_id)
+
             cost = 0.0
+            is_generation = span_type == SpanType.GENERATION
 
             # Calculate cost for generation spans
-            if span_type == SpanType.GENERATION:
-                cost = self._calculate_generation_cost(span_data)
-                trace_id = span.trace_id
-                with self._lock:
+            if is_generation:
+                model = span_data.get("model")
+                if type(model) is str:
+                    # A handful of names repeat across every span
+                    model = span_data["model"] = sys.intern(model)
+                input_tokens = span_data.get("input_tokens") or 0
+                output_tokens = span_data.get("output_tokens") or 0
+                cost = self._calculate_generation_cost(model, input_tokens, output_tokens)
+
+            if is_generation:
+                with self._lock_for(trace_id):
                     if trace_id in self._trace_costs:
                         self._trace_costs[trace_id] += cost
-                    input_tokens = span_data.get("input_tokens", 0)
-                    output_tokens = span_data.get("output_tokens", 0)
-                    if trace_id in self._trace_tokens:
-                        self._trace_tokens[trace_id]["input"] += input_tokens
-                        self._trace_tokens[trace_id]["output"] += output_tokens
-
-            with self._lock:
-                self._db.update_span_end(
-                    span_id=span.span_id,
-                    ended_at=time.time(),
-                    span_data=span_data,
-                    error=error,
-                    cost=cost,
-                )
+                        self._trace_tokens[trace_id] += input_tokens + output_tokens
+
+            self._writer.submit(partial(
+                self._db.update_span_end,
+                span_id=span.span_id,
+                ended_at=time.time(),
+                span_data=span_data,
+                error=error,
+                cost=cost,
+            ))
 
         except Exception:
             logger.exception("TraceBoard: error in on_span_end")
 
     def shutdown(self) -> None:
-        """Clean up resources."""
+        """Write everything still queued, stop the writer and close the DB."""
         try:
-            with self._lock:
-                self._db.close()
+            self._writer.close()
+            self._db.close()
             logger.info("TraceBoard shutdown complete.")
         except Exception:
             logger.exception("TraceBoard: error during shutdown")
 
     def force_flush(self) -> None:
-        """Force flush — no-op since we write immediately."""
-        pass
+        """Block until every write queued so far is committed."""
+        try:
+            self._writer.flush()
+        except Exception:
+            logger.exception("TraceBoard: error in force_flush")
 
     # ── Internal helpers ───────────────────────────────────────────────
 
+    def _hold_span(self, record: SpanRecord) -> bool:
+        """Buffer a span start if its trace is unsampled; False otherwise."""
+        with self._lock_for(record.trace_id):
+            pending = self._unsampled.get(record.trace_id)
+            if pending is None:
+                return False
+            pending.open_spans[record.span_id] = record
+            return True
+
+    def _release_span(self, trace_id: str, span_id: str) -> bool:
+        """Forget a span of an unsampled trace that ended cleanly.
+
+        Returns False if the trace has been promoted meanwhile, in which
+        case the span's start was already written.
+        """
+        with self._lock_for(trace_id):
+            pending = self._unsampled.get(trace_id)
+            if pending is None:
+                return False
+            pending.open_spans.pop(span_id, None)
+            return True
+
+    def _promote_trace(self, trace_id: str) -> None:
+        """Start recording an unsampled trace after one of its spans failed.
+
+        The trace and every span still open in it (the failed span and its
+        ancestors among them) are written, so the span's end and any later
+        span of the trace update rows that exist.
+        """
+        with self._lock_for(trace_id):
+            pending = self._unsampled.pop(trace_id, None)
+            if pending is None:
+                return
+            self._trace_tokens[trace_id] = 0
+            self._trace_costs[trace_id] = 0.0
+            # Submitted under the lock so no span start of this trace can
+            # slip in ahead of them
+            self._writer.submit(partial(self._db.insert_trace, pending.record))
+            for record in pending.open_spans.values():
+                self._writer.submit(partial(self._db.insert_span, record))
+
+    def _lock_for(self, trace_id: str) -> threading.Lock:
+        """Return the stripe lock guarding ``trace_id``'s aggregates."""
+        return self._stripes[hash(trace_id) % _LOCK_STRIPES]
+
     @staticmethod
     def _resolve_span_type(span_data: Any) -> SpanType:
         """Determine span type from the span_data object's class name."""
@@ -211,65 +341,39 @@ class TraceBoardProcessor(TracingProcessor):
             return {}
 
         result: dict[str, Any] = {"type": span_type.value}
+        attrs = _SPAN_DATA_ATTRS.get(span_type)
 
-        if span_type == SpanType.GENERATION:
-            # LLM generation data
-            for attr in (
-                "model",
-                "model_config",
-                "input",
-                "output",
-                "input_tokens",
-                "output_tokens",
-            ):
-                val = getattr(span_data, attr, None)
-                if val is not None:
-                    result[attr] = _safe_serialize(val)
-
-            # Usage from response
-            usage = getattr(span_data, "usage", None)
-            if usage:
-                if hasattr(usage, "input_tokens"):
-                    result["input_tokens"] = usage.input_tokens
-                if hasattr(usage, "output_tokens"):
-                    result["output_tokens"] = usage.output_tokens
-                if hasattr(usage, "total_tokens"):
-                    result["total_tokens"] = usage.total_tokens
-
-        elif span_type == SpanType.FUNCTION:
-            for attr in ("name", "input", "output"):
-                val = getattr(span_data, attr, None)
-                if val is not None:
-                    result[attr] = _safe_serialize(val)
-
-        elif span_type == SpanType.AGENT:
-            for attr in ("name", "handoffs", "tools", "output_type"):
-                val = getattr(span_data, attr, None)
-                if val is not None:
-                    result[attr] = _safe_serialize(val)
-
-        elif span_type == SpanType.HANDOFF:
-            for attr in ("from_agent", "to_agent"):
-                val = getattr(span_data, attr, None)
-                if val is not None:
-                    result[attr] = _safe_serialize(val)
-
-        elif span_type == SpanType.GUARDRAIL:
-            for attr in ("name", "triggered"):
+        if attrs is not None:
+            for attr in attrs:
                 val = getattr(span_data, attr, None)
                 if val is not None:
                     result[attr] = _safe_serialize(val)
 
+            if span_type is SpanType.GENERATION:
+                # Usage from response
+                usage = getattr(span_data, "usage", None)
+                if usage:
+                    if hasattr(usage, "input_tokens"):
+                        result["input_tokens"] = usage.input_tokens
+                    if hasattr(usage, "output_tokens"):
+                        result["output_tokens"] = usage.output_tokens
+                    if hasattr(usage, "total_tokens"):
+                        result["total_tokens"] = usage.total_tokens
         else:
             # Generic: try to capture any public attributes
-            for attr in dir(span_data):
-                if not attr.startswith("_"):
-                    try:
-                        val = getattr(span_data, attr)
-                        if not callable(val):
-                            result[attr] = _safe_serialize(val)
-                    except Exception:
-                        pass
+            attrs = _public_attrs(type(span_data))
+            instance_dict = getattr(span_data, "__dict__", None)
+            if instance_dict:
+                attrs = sorted(
+                    {*attrs, *(k for k in instance_dict if not k.startswith("_"))}
+                )
+            for attr in attrs:
+                try:
+                    val = getattr(span_data, attr)
+                    if not callable(val):
+                        result[attr] = _safe_serialize(val)
+                except Exception:
+                    pass
 
         return result
 
@@ -286,20 +390,49 @@ class TraceBoardProcessor(TracingProcessor):
         return {"message": str(error)}
 
     @staticmethod
-    def _calculate_generation_cost(span_data: dict[str, Any]) -> float:
-        """Calculate cost from generation span data."""
-        model = span_data.get("model", "")
-        input_tokens = span_data.get("input_tokens", 0) or 0
-        output_tokens = span_data.get("output_tokens", 0) or 0
+    def _calculate_generation_cost(
+        model: str | None, input_tokens: int, output_tokens: int
+    ) -> float:
+        """Calculate cost for a generation span's token counts."""
         if model and (input_tokens or output_tokens):
             return calculate_cost(model, input_tokens, output_tokens)
         return 0.0
 
 
+@lru_cache(maxsize=64)
+def _public_attrs(cls: type) -> tuple[str, ...]:
+    """Public data attributes visible on ``cls``: slots, properties, fields.
+
+    Methods are dropped here, once per class; attributes that only
+    exist on the instance are merged in by the caller.
+    """
+    return tuple(
+        attr
+        for attr in dir(cls)
+        if not attr.startswith("_") and not callable(getattr(cls, attr, None))
+    )
+
+
+# Exact types returned as-is by _safe_serialize without isinstance checks
+_JSON_SCALARS = frozenset({str, int, float, bool, type(None)})
+
+
 def _safe_serialize(value: Any) -> Any:
-    """Safely convert a value to a JSON-serializable form."""
-    if value is None:
-        return None
+    """Safely convert a value to a JSON-serializable form.
+
+    Containers are always copied: the writer thread encodes the result
+    later, after the SDK may have mutated the original.
+    """
+    value_type = type(value)
+    if value_type in _JSON_SCALARS:
+        return value
+    if value_type is dict:
+        return {
+            k if type(k) is str else str(k): v if type(v) in _JSON_SCALARS else _safe_serialize(v)
+            for k, v in value.items()
+        }
+    if value_type is list or value_type is tuple:
+        return [v if type(v) in _JSON_SCALARS else _safe_serialize(v) for v in value]
     if isinstance(value, (str, int, float, bool)):
         return value
     if isinstance(value, (list, tuple)):
@@ -2,6 +2,7 @@
 
 from __future__ import annotations
 
+import asyncio
 from contextlib import asynccontextmanager
 from pathlib import Path
 
@@ -10,20 +11,40 @@ from fastapi.middleware.cors import CORSMiddleware
 from fastapi.staticfiles import StaticFiles
 
 from traceboard.server.database import Database
+from traceboard.server.routes.metrics import push_updates
 from traceboard.server.routes.metrics import router as metrics_router
 from traceboard.server.routes.spans import router as spans_router
 from traceboard.server.routes.traces import router as traces_router
 
 
-def create_app(db_path: str = "./traceboard.db") -> FastAPI:
-    """Create and configure the FastAPI application."""
+def create_app(
+    db_path: str = "./traceboard.db",
+    browser_url: str | None = None,
+) -> FastAPI:
+    """Create and configure the FastAPI application.
+
+    If ``browser_url`` is given, it is opened in the default browser
+    shortly after startup.
+    """
 
     db = Database(db_path=db_path)
 
     @asynccontextmanager
     async def lifespan(app: FastAPI):
         await db.connect()
+        if browser_url:
+            from traceboard._browser import open_url
+
+            # Startup runs just before the server binds; give it a moment
+            asyncio.get_running_loop().call_later(0.5, open_url, browser_url)
+        # One metrics poller shared by every live-update WebSocket
+        poller = asyncio.create_task(push_updates(db))
         yield
+        poller.cancel()
+        try:
+            await poller
+        except asyncio.CancelledError:
+            pass
         await db.close()
 
     app = FastAPI(
@@ -2,17 +2,23 @@
 
 from __future__ import annotations
 
-import json
+import asyncio
 import sqlite3
+import time
+from collections import deque
+from collections.abc import AsyncIterator, Iterator, Sequence
+from contextlib import asynccontextmanager, contextmanager
 from pathlib import Path
 from typing import Any
 
 import aiosqlite
 
+from traceboard import _json
 from traceboard.server.models import (
     MetricsResponse,
     SpanRecord,
     SpanTreeNode,
+    SpanType,
     TraceListItem,
     TraceRecord,
     TraceStatus,
@@ -44,36 +50,257 @@ CREATE TABLE IF NOT EXISTS spans (
     span_data  TEXT NOT NULL DEFAULT '{}',
     error      TEXT,
     cost       REAL NOT NULL DEFAULT 0.0,
+    model      TEXT,
     FOREIGN KEY (trace_id) REFERENCES traces(trace_id) ON DELETE CASCADE
 );
 
-CREATE INDEX IF NOT EXISTS idx_spans_trace_id ON spans(trace_id);
+CREATE INDEX IF NOT EXISTS idx_spans_trace_started ON spans(trace_id, started_at);
 CREATE INDEX IF NOT EXISTS idx_spans_parent_id ON spans(parent_id);
-CREATE INDEX IF NOT EXISTS idx_traces_started_at ON traces(started_at);
-CREATE INDEX IF NOT EXISTS idx_traces_status ON traces(status);
+CREATE INDEX IF NOT EXISTS idx_traces_started_id ON traces(started_at, trace_id);
+CREATE INDEX IF NOT EXISTS idx_traces_status_started ON traces(status, started_at DESC);
+
+-- Superseded by the composite indexes above (leftmost-prefix covers them).
+DROP INDEX IF EXISTS idx_spans_trace_id;
+DROP INDEX IF EXISTS idx_traces_status;
+DROP INDEX IF EXISTS idx_traces_started_at;
+"""
+
+# Adds spans.model to databases created before it existed.  The column
+# mirrors span_data's "model" so metrics can group by it without decoding
+# JSON; span_data stays the source of truth.
+HAS_SPAN_MODEL_SQL = "SELECT 1 FROM pragma_table_info('spans') WHERE name = 'model'"
+SPAN_MODEL_MIGRATION: tuple[str, ...] = (
+    "ALTER TABLE spans ADD COLUMN model TEXT",
+    """UPDATE spans SET model = json_extract(span_json(span_data), '$.model')
+       WHERE json_valid(span_json(span_data))""",
+)
+
+# Applied to every connection.  WAL lets dashboard readers run alongside
+# SDK writers; synchronous=NORMAL is durable under WAL except for the last
+# transactions before a power loss, which is fine for trace data.
+CONNECTION_PRAGMAS: tuple[str, ...] = (
+    "PRAGMA journal_mode=WAL",
+    "PRAGMA synchronous=NORMAL",
+    "PRAGMA foreign_keys=ON",
+    "PRAGMA busy_timeout=5000",
+    "PRAGMA wal_autocheckpoint=1000",
+    "PRAGMA cache_size=-65536",
+    "PRAGMA mmap_size=268435456",
+    "PRAGMA temp_store=MEMORY",
+)
+
+# Hot-path statements are kept as module constants so every call passes the
+# identical SQL string and hits sqlite3's per-connection statement cache
+# instead of re-parsing and re-planning.
+
+# Upserts rather than INSERT OR REPLACE: REPLACE deletes the old row
+# first, and that delete cascades to the trace's spans.
+INSERT_TRACE_SQL = """INSERT INTO traces
+   (trace_id, workflow_name, group_id, started_at, ended_at,
+    status, metadata, total_tokens, total_cost)
+   VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)
+   ON CONFLICT(trace_id) DO UPDATE SET
+    workflow_name=excluded.workflow_name, group_id=excluded.group_id,
+    started_at=excluded.started_at, ended_at=excluded.ended_at,
+    status=excluded.status, metadata=excluded.metadata,
+    total_tokens=excluded.total_tokens, total_cost=excluded.total_cost"""
+
+INSERT_SPAN_SQL = """INSERT INTO spans
+   (span_id, trace_id, parent_id, span_type, name,
+    started_at, ended_at, span_data, error, cost, model)
+   VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+   ON CONFLICT(span_id) DO UPDATE SET
+    trace_id=excluded.trace_id, parent_id=excluded.parent_id,
+    span_type=excluded.span_type, name=excluded.name,
+    started_at=excluded.started_at, ended_at=excluded.ended_at,
+    span_data=excluded.span_data, error=excluded.error,
+    cost=excluded.cost, model=excluded.model"""
+
+UPDATE_TRACE_END_SQL = """UPDATE traces SET ended_at=?, status=?, total_tokens=?, total_cost=?
+   WHERE trace_id=?"""
+
+UPDATE_SPAN_END_SQL = """UPDATE spans SET ended_at=?, span_data=?, error=?, cost=?, model=?
+   WHERE span_id=?"""
+
+# Statement cache size for the SDK writer connection
+_SYNC_CACHED_STATEMENTS = 256
+
+
+# Explicit column lists in model field order, so hot read paths can
+# unpack rows positionally instead of looking each column up by name.
+# Derived columns such as spans.model are left out.
+TRACE_COLUMNS = (
+    "t.trace_id, t.workflow_name, t.group_id, t.started_at, t.ended_at, "
+    "t.status, t.metadata, t.total_tokens, t.total_cost"
+)
+SPAN_COLUMNS = (
+    "s.span_id, s.trace_id, s.parent_id, s.span_type, s.name, "
+    "s.started_at, s.ended_at, s.span_data, s.error, s.cost"
+)
+
+# Span rows fetched per round trip when merging spans into an export
+EXPORT_CHUNK_SIZE = 256
+
+
+def take_trace_spans(buffer: deque[Sequence[Any]], trace_id: str, out: list[Sequence[Any]]) -> bool:
+    """Move the leading :data:`SPAN_COLUMNS` rows of ``trace_id`` into ``out``.
+
+    Exports read spans with one query sorted in the same trace order as
+    the traces query and merge the two in one pass; ``buffer`` holds the
+    span rows fetched so far.  Returns True if the buffer ran dry, in
+    which case the caller should fetch the next chunk and call again.
+    """
+    while buffer:
+        if buffer[0][1] != trace_id:
+            return False
+        out.append(buffer.popleft())
+    return True
+
+
+SPAN_TREE_SQL = f"""
+WITH RECURSIVE tree(span_id, depth) AS (
+    SELECT span_id, 0 FROM spans
+    WHERE trace_id = ?1
+      AND (parent_id IS NULL OR parent_id = ''
+           OR parent_id NOT IN (SELECT span_id FROM spans WHERE trace_id = ?1))
+    UNION ALL
+    SELECT s.span_id, tree.depth + 1
+    FROM spans s JOIN tree ON s.parent_id = tree.span_id
+    WHERE s.trace_id = ?1
+)
+SELECT tree.depth, {SPAN_COLUMNS}
+FROM tree JOIN spans s ON s.span_id = tree.span_id
+ORDER BY tree.depth, s.started_at
 """
 
 
+def _trace_row(trace: TraceRecord) -> tuple[Any, ...]:
+    """Pack a trace into INSERT_TRACE_SQL parameter order."""
+    return (
+        trace.trace_id,
+        trace.workflow_name,
+        trace.group_id,
+        trace.started_at,
+        trace.ended_at,
+        trace.status.value,
+        _json.dumps(trace.metadata),
+        trace.total_tokens,
+        trace.total_cost,
+    )
+
+
+def _span_row(span: SpanRecord) -> tuple[Any, ...]:
+    """Pack a span into INSERT_SPAN_SQL parameter order."""
+    return (
+        span.span_id,
+        span.trace_id,
+        span.parent_id,
+        span.span_type.value,
+        span.name,
+        span.started_at,
+        span.ended_at,
+        _json.pack(span.span_data),
+        _json.dumps(span.error) if span.error else None,
+        span.cost,
+        _span_model(span.span_data),
+    )
+
+
+def _span_end_row(
+    span_id: str, ended_at: float, span_data: dict, error: dict | None, cost: float
+) -> tuple[Any, ...]:
+    """Pack a span completion into UPDATE_SPAN_END_SQL parameter order."""
+    return (
+        ended_at,
+        _json.pack(span_data),
+        _json.dumps(error) if error else None,
+        cost,
+        _span_model(span_data),
+        span_id,
+    )
+
+
+def _span_model(span_data: dict[str, Any]) -> str | None:
+    """Value for the ``spans.model`` column."""
+    model = span_data.get("model")
+    return model if isinstance(model, str) else None
+
+
 class Database:
-    """Async SQLite database wrapper for TraceBoard."""
+    """Async SQLite database wrapper for TraceBoard.
 
-    def __init__(self, db_path: str = "./traceboard.db"):
+    Writes go through a single primary connection (SQLite only allows one
+    writer at a time anyway).  Reads are served from a small pool of
+    long-lived connections so concurrent API requests don't queue behind
+    each other and each connection keeps its page cache warm.
+
+    :meth:`get_metrics` results are cached for up to ``metrics_ttl``
+    seconds and dropped as soon as :meth:`change_token` moves, i.e. on any
+    write made through this instance or committed by an SDK process.
+    """
+
+    def __init__(
+        self,
+        db_path: str = "./traceboard.db",
+        pool_size: int = 4,
+        metrics_ttl: float = 1.0,
+    ):
         self.db_path = db_path
+        self.pool_size = max(1, pool_size)
+        self.metrics_ttl = metrics_ttl
         self._db: aiosqlite.Connection | None = None
+        self._readers: list[aiosqlite.Connection] = []
+        self._idle: asyncio.Queue[aiosqlite.Connection] | None = None
+
+        # (computed_at, change_token, metrics)
+        self._metrics_cache: tuple[float, tuple[int, int], MetricsResponse] | None = None
+        self._write_epoch = 0
+        # Set on every write through this instance; see wait_for_write()
+        self._written = asyncio.Event()
+
+    async def _open_connection(self) -> aiosqlite.Connection:
+        """Open a connection with TraceBoard's row factory and PRAGMAs."""
+        conn = await aiosqlite.connect(self.db_path)
+        conn.row_factory = aiosqlite.Row
+        for pragma in CONNECTION_PRAGMAS:
+            await conn.execute(pragma)
+        # Lets SQL JSON functions see through compressed span_data BLOBs
+        await conn.create_function("span_json", 1, _json.unpack_text, deterministic=True)
+        return conn
 
     async def connect(self) -> None:
-        """Open database connection and ensure schema exists."""
+        """Open database connections and ensure schema exists."""
         Path(self.db_path).parent.mkdir(parents=True, exist_ok=True)
-        self._db = await aiosqlite.connect(self.db_path)
-        self._db.row_factory = aiosqlite.Row
-        await self._db.execute("PRAGMA journal_mode=WAL")
-        await self._db.execute("PRAGMA foreign_keys=ON")
+        self._db = await self._open_connection()
         await self._db.executescript(SCHEMA_SQL)
         await self._db.commit()
 
+        # IMMEDIATE so a concurrent SDK process can't migrate at the same time
+        await self._db.execute("BEGIN IMMEDIATE")
+        async with self._db.execute(HAS_SPAN_MODEL_SQL) as cur:
+            migrated = await cur.fetchone()
+        if not migrated:
+            for sql in SPAN_MODEL_MIGRATION:
+                await self._db.execute(sql)
+        await self._db.commit()
+        # The dashboard is long-lived; seed planner statistics now (a
+        # no-op unless they are missing or stale) rather than only at exit
+        await self._db.execute("PRAGMA optimize=0x10002")
+
+        self._idle = asyncio.Queue()
+        for _ in range(self.pool_size):
+            conn = await self._open_connection()
+            self._readers.append(conn)
+            self._idle.put_nowait(conn)
+
     async def close(self) -> None:
-        """Close database connection."""
+        """Close all database connections."""
+        for conn in self._readers:
+            await conn.close()
+        self._readers = []
+        self._idle = None
         if self._db:
+            await self._db.execute("PRAGMA optimize")
             await self._db.close()
             self._db = None
 
@@ -83,28 +310,55 @@ class Database:
             raise RuntimeError("Database not connected. Call connect() first.")
         return self._db
 
+    def _invalidate(self) -> None:
+        """Mark cached read results stale after a write."""
+        self._write_epoch += 1
+        self._metrics_cache = None
+        self._written.set()
+
+    async def change_token(self) -> tuple[int, int]:
+        """Return a value that changes whenever the database contents do.
+
+        Combines this instance's write counter with ``PRAGMA data_version``,
+        which moves when another connection (e.g. an SDK process) commits.
+        """
+        async with self.db.execute("PRAGMA data_version") as cur:
+            row = await cur.fetchone()
+        return self._write_epoch, row[0]
+
+    async def wait_for_write(self, timeout: float) -> bool:
+        """Wait up to ``timeout`` seconds for a write through this instance.
+
+        Returns whether one happened.  Writes from other processes don't
+        wake this up; poll :meth:`change_token` for those.
+        """
+        try:
+            await asyncio.wait_for(self._written.wait(), timeout)
+        except asyncio.TimeoutError:
+            return False
+        finally:
+            self._written.clear()
+        return True
+
+    @asynccontextmanager
+    async def _reader(self) -> AsyncIterator[aiosqlite.Connection]:
+        """Borrow a pooled read connection for the duration of the block."""
+        if self._idle is None:
+            raise RuntimeError("Database not connected. Call connect() first.")
+        idle = self._idle
+        conn = await idle.get()
+        try:
+            yield conn
+        finally:
+            idle.put_nowait(conn)
+
     # ── Trace operations ───────────────────────────────────────────────
 
     async def insert_trace(self, trace: TraceRecord) -> None:
         """Insert or replace a trace record."""
-        await self.db.execute(
-            """INSERT OR REPLACE INTO traces
-               (trace_id, workflow_name, group_id, started_at, ended_at,
-                status, metadata, total_tokens, total_cost)
-               VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)""",
-            (
-                trace.trace_id,
-                trace.workflow_name,
-                trace.group_id,
-                trace.started_at,
-                trace.ended_at,
-                trace.status.value,
-                json.dumps(trace.metadata),
-                trace.total_tokens,
-                trace.total_cost,
-            ),
-        )
+        await self.db.execute(INSERT_TRACE_SQL, _trace_row(trace))
         await self.db.commit()
+        self._invalidate()
 
     async def update_trace(self, trace: TraceRecord) -> None:
         """Update an existing trace record."""
@@ -118,23 +372,25 @@ class Database:
                 trace.group_id,
                 trace.ended_at,
                 trace.status.value,
-                json.dumps(trace.metadata),
+                _json.dumps(trace.metadata),
                 trace.total_tokens,
                 trace.total_cost,
                 trace.trace_id,
             ),
         )
         await self.db.commit()
+        self._invalidate()
 
     async def get_trace(self, trace_id: str) -> TraceRecord | None:
         """Get a single trace by ID."""
-        async with self.db.execute(
-            "SELECT * FROM traces WHERE trace_id = ?", (trace_id,)
-        ) as cursor:
-            row = await cursor.fetchone()
-            if row is None:
-                return None
-            return self._row_to_trace(row)
+        async with self._reader() as conn:
+            async with conn.execute(
+                f"SELECT {TRACE_COLUMNS} FROM traces t WHERE t.trace_id = ?", (trace_id,)
+            ) as cursor:
+                row = await cursor.fetchone()
+        if row is None:
+            return None
+        return self._row_to_trace(row)
 
     async def list_traces(
         self,
@@ -142,8 +398,16 @@ class Database:
         page_size: int = 50,
         status: str | None = None,
         workflow_name: str | None = None,
+        after: float | None = None,
+        after_id: str | None = None,
     ) -> tuple[list[TraceListItem], int]:
-        """List traces with pagination and optional filters."""
+        """List traces with pagination and optional filters.
+
+        When ``after`` is given, the page starts at the first trace that
+        started before it (keyset pagination) and ``page`` is ignored.
+        Passing the last item's ``trace_id`` as ``after_id`` as well keeps
+        traces that share its start time from being skipped.
+        """
         where_parts: list[str] = []
         params: list[Any] = []
 
@@ -155,94 +419,98 @@ class Database:
             params.append(f"%{workflow_name}%")
 
         where_clause = f"WHERE {' AND '.join(where_parts)}" if where_parts else ""
-
-        # Count total
         count_sql = f"SELECT COUNT(*) FROM traces t {where_clause}"
-        async with self.db.execute(count_sql, params) as cursor:
-            row = await cursor.fetchone()
-            total = row[0] if row else 0
 
-        # Fetch page
-        offset = (page - 1) * page_size
+        page_parts = list(where_parts)
+        page_params = list(params)
+        if after is not None and after_id is not None:
+            page_parts.append("(t.started_at, t.trace_id) < (?, ?)")
+            page_params += [after, after_id]
+            offset = 0
+        elif after is not None:
+            page_parts.append("t.started_at < ?")
+            page_params.append(after)
+            offset = 0
+        else:
+            offset = (page - 1) * page_size
+        page_where = f"WHERE {' AND '.join(page_parts)}" if page_parts else ""
+
+        # Span counts are looked up only for the rows on the page
         query_sql = f"""
-            SELECT t.*,
-                   COUNT(s.span_id) as span_count
+            SELECT t.trace_id, t.workflow_name, t.group_id, t.started_at,
+                   t.ended_at, t.status, t.total_tokens, t.total_cost,
+                   (SELECT COUNT(*) FROM spans s
+                    WHERE s.trace_id = t.trace_id) as span_count
             FROM traces t
-            LEFT JOIN spans s ON s.trace_id = t.trace_id
-            {where_clause}
-            GROUP BY t.trace_id
-            ORDER BY t.started_at DESC
+            {page_where}
+            ORDER BY t.started_at DESC, t.trace_id DESC
             LIMIT ? OFFSET ?
         """
-        query_params = params + [page_size, offset]
+        query_params = page_params + [page_size, offset]
 
         items: list[TraceListItem] = []
-        async with self.db.execute(query_sql, query_params) as cursor:
-            async for row in cursor:
-                started = row["started_at"]
-                ended = row["ended_at"]
-                duration = (ended - started) * 1000 if ended else None
-                items.append(
-                    TraceListItem(
-                        trace_id=row["trace_id"],
-                        workflow_name=row["workflow_name"],
-                        group_id=row["group_id"],
-                        started_at=started,
-                        ended_at=ended,
-                        status=TraceStatus(row["status"]),
-                        total_tokens=row["total_tokens"],
-                        total_cost=row["total_cost"],
-                        duration_ms=duration,
-                        span_count=row["span_count"],
+        async with self._reader() as conn:
+            # Count total
+            async with conn.execute(count_sql, params) as cursor:
+                row = await cursor.fetchone()
+                total = row[0] if row else 0
+
+            # Fetch page
+            async with conn.execute(query_sql, query_params) as cursor:
+                async for row in cursor:
+                    (trace_id, workflow_name, group_id, started, ended,
+                     status, total_tokens, total_cost, span_count) = row
+                    duration = (ended - started) * 1000 if ended else None
+                    items.append(
+                        TraceListItem.model_construct(
+                            trace_id=trace_id,
+                            workflow_name=workflow_name,
+                            group_id=group_id,
+                            started_at=started,
+                            ended_at=ended,
+                            status=TraceStatus(status),
+                            total_tokens=total_tokens,
+                            total_cost=total_cost,
+                            duration_ms=duration,
+                            span_count=span_count,
+                        )
                     )
-                )
         return items, total
 
     # ── Span operations ────────────────────────────────────────────────
 
     async def insert_span(self, span: SpanRecord) -> None:
         """Insert or replace a span record."""
-        await self.db.execute(
-            """INSERT OR REPLACE INTO spans
-               (span_id, trace_id, parent_id, span_type, name,
-                started_at, ended_at, span_data, error, cost)
-               VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)""",
-            (
-                span.span_id,
-                span.trace_id,
-                span.parent_id,
-                span.span_type.value,
-                span.name,
-                span.started_at,
-                span.ended_at,
-                json.dumps(span.span_data),
-                json.dumps(span.error) if span.error else None,
-                span.cost,
-            ),
-        )
+        await self.db.execute(INSERT_SPAN_SQL, _span_row(span))
+        await self.db.commit()
+        self._invalidate()
+
+    async def insert_spans(self, spans: list[SpanRecord]) -> None:
+        """Insert or replace many span records in one statement batch."""
+        await self.db.executemany(INSERT_SPAN_SQL, [_span_row(s) for s in spans])
         await self.db.commit()
+        self._invalidate()
 
     async def update_span(self, span: SpanRecord) -> None:
         """Update an existing span record."""
         await self.db.execute(
-            """UPDATE spans SET
-               ended_at=?, span_data=?, error=?, cost=?
-               WHERE span_id=?""",
-            (
-                span.ended_at,
-                json.dumps(span.span_data),
-                json.dumps(span.error) if span.error else None,
-                span.cost,
-                span.span_id,
-            ),
+            UPDATE_SPAN_END_SQL,
+            _span_end_row(span.span_id, span.ended_at, span.span_data, span.error, span.cost),
         )
         await self.db.commit()
+        self._invalidate()
 
     async def get_spans_for_trace(self, trace_id: str) -> list[SpanRecord]:
         """Get all spans belonging to a trace."""
+        async with self._reader() as conn:
+            return await self._fetch_spans(conn, trace_id)
+
+    async def _fetch_spans(
+        self, conn: aiosqlite.Connection, trace_id: str
+    ) -> list[SpanRecord]:
         spans: list[SpanRecord] = []
-        async with self.db.execute(
-            "SELECT * FROM spans WHERE trace_id = ? ORDER BY started_at ASC",
+        async with conn.execute(
+            f"SELECT {SPAN_COLUMNS} FROM spans s WHERE s.trace_id = ? ORDER BY s.started_at ASC",
             (trace_id,),
         ) as cursor:
             async for row in cursor:
@@ -250,90 +518,146 @@ class Database:
         return spans
 
     async def build_span_tree(self, trace_id: str) -> list[SpanTreeNode]:
-        """Build a tree of spans for a trace."""
-        spans = await self.get_spans_for_trace(trace_id)
+        """Build a tree of spans for a trace.
+
+        A recursive CTE walks the ``parent_id`` index from the root spans
+        and returns every row labelled with its depth, ordered so that a
+        parent always precedes its children; the tree is then linked up in
+        a single pass.  Spans whose parent is missing are treated as roots.
+        """
+        async with self._reader() as conn:
+            async with conn.execute(SPAN_TREE_SQL, (trace_id,)) as cursor:
+                rows = await cursor.fetchall()
 
         nodes: dict[str, SpanTreeNode] = {}
-        for s in spans:
-            duration = (s.ended_at - s.started_at) * 1000 if s.ended_at else None
-            nodes[s.span_id] = SpanTreeNode(
-                span_id=s.span_id,
-                trace_id=s.trace_id,
-                parent_id=s.parent_id,
-                span_type=s.span_type,
-                name=s.name,
-                started_at=s.started_at,
-                ended_at=s.ended_at,
-                span_data=s.span_data,
-                error=s.error,
-                cost=s.cost,
-                duration_ms=duration,
+        roots: list[SpanTreeNode] = []
+        for row in rows:
+            # Built straight from the row; no intermediate SpanRecord
+            fields = self._span_fields(row[1:])
+            ended = fields["ended_at"]
+            node = SpanTreeNode.model_construct(
+                **fields,
+                duration_ms=(ended - fields["started_at"]) * 1000 if ended else None,
+                children=[],
+            )
+            nodes[node.span_id] = node
+            if row[0]:
+                nodes[node.parent_id].children.append(node)
+            else:
+                roots.append(node)
+
+        return roots
+
+    async def get_spans_and_tree(
+        self, trace_id: str
+    ) -> tuple[list[SpanRecord], list[SpanTreeNode]]:
+        """Return both :meth:`get_spans_for_trace` and :meth:`build_span_tree`.
+
+        Reads and decodes each span once.  Rows arrive in start order, so
+        every children list comes out in the same order as the recursive
+        CTE produces.  As there, spans whose parent is missing become roots
+        and spans not reachable from a root (self-parented or in a parent
+        cycle) are left out of the tree.
+        """
+        async with self._reader() as conn:
+            async with conn.execute(
+                f"SELECT {SPAN_COLUMNS} FROM spans s WHERE s.trace_id = ? ORDER BY s.started_at ASC",
+                (trace_id,),
+            ) as cursor:
+                rows = await cursor.fetchall()
+
+        spans: list[SpanRecord] = []
+        nodes: dict[str, SpanTreeNode] = {}
+        for row in rows:
+            fields = self._span_fields(row)
+            spans.append(SpanRecord.model_construct(**fields))
+            ended = fields["ended_at"]
+            nodes[fields["span_id"]] = SpanTreeNode.model_construct(
+                **fields,
+                duration_ms=(ended - fields["started_at"]) * 1000 if ended else None,
                 children=[],
             )
 
         roots: list[SpanTreeNode] = []
+        by_parent: dict[str, list[SpanTreeNode]] = {}
         for node in nodes.values():
             if node.parent_id and node.parent_id in nodes:
-                nodes[node.parent_id].children.append(node)
+                by_parent.setdefault(node.parent_id, []).append(node)
             else:
                 roots.append(node)
-
-        return roots
+        # Attach children walking down from the roots, like the CTE does,
+        # so a parent cycle can never end up linked into the tree.
+        stack = list(roots)
+        while stack:
+            node = stack.pop()
+            children = by_parent.get(node.span_id)
+            if children:
+                node.children = children
+                stack.extend(children)
+        return spans, roots
 
     # ── Metrics ────────────────────────────────────────────────────────
 
     async def get_metrics(self) -> MetricsResponse:
-        """Compute aggregated metrics from all traces."""
-        metrics = MetricsResponse()
-
-        async with self.db.execute("SELECT COUNT(*) FROM traces") as cur:
-            row = await cur.fetchone()
-            metrics.total_traces = row[0] if row else 0
+        """Get aggregated metrics, served from cache while still fresh."""
+        cached = self._metrics_cache
+        now = time.monotonic()
+        token = await self.change_token()
+        if (
+            cached is not None
+            and cached[1] == token
+            and now - cached[0] < self.metrics_ttl
+        ):
+            return cached[2]
+
+        metrics = await self._compute_metrics()
+        if token[0] == self._write_epoch:
+            self._metrics_cache = (now, token, metrics)
+        return metrics
 
-        async with self.db.execute("SELECT COUNT(*) FROM spans") as cur:
-            row = await cur.fetchone()
-            metrics.total_spans = row[0] if row else 0
+    async def _compute_metrics(self) -> MetricsResponse:
+        """Compute aggregated metrics from all traces.
 
-        async with self.db.execute(
-            "SELECT COALESCE(SUM(total_tokens),0), COALESCE(SUM(total_cost),0) FROM traces"
-        ) as cur:
-            row = await cur.fetchone()
-            if row:
-                metrics.total_tokens = int(row[0])
-                metrics.total_cost = float(row[1])
-
-        async with self.db.execute(
-            """SELECT AVG((ended_at - started_at) * 1000)
-               FROM traces WHERE ended_at IS NOT NULL"""
-        ) as cur:
-            row = await cur.fetchone()
-            if row and row[0] is not None:
-                metrics.avg_duration_ms = round(float(row[0]), 2)
+        All summation happens inside SQLite; only O(1) rows plus one row
+        per status and per model are transferred back.
+        """
+        metrics = MetricsResponse()
 
-        async with self.db.execute(
-            "SELECT COUNT(*) FROM traces WHERE status = 'error'"
-        ) as cur:
-            row = await cur.fetchone()
-            metrics.error_count = row[0] if row else 0
-
-        async with self.db.execute(
-            "SELECT status, COUNT(*) FROM traces GROUP BY status"
-        ) as cur:
-            async for row in cur:
-                metrics.traces_by_status[row[0]] = row[1]
-
-        async with self.db.execute(
-            "SELECT span_data, cost FROM spans WHERE span_type = 'generation' AND cost > 0"
-        ) as cur:
-            async for row in cur:
-                try:
-                    data = json.loads(row[0]) if isinstance(row[0], str) else row[0]
-                    model = data.get("model", "unknown")
-                    metrics.cost_by_model[model] = (
-                        metrics.cost_by_model.get(model, 0.0) + row[1]
-                    )
-                except (json.JSONDecodeError, AttributeError):
-                    pass
+        async with self._reader() as conn:
+            async with conn.execute(
+                """SELECT COUNT(*),
+                          COALESCE(SUM(total_tokens), 0),
+                          COALESCE(SUM(total_cost), 0),
+                          AVG(CASE WHEN ended_at IS NOT NULL
+                                   THEN (ended_at - started_at) * 1000 END),
+                          COALESCE(SUM(status = 'error'), 0),
+                          (SELECT COUNT(*) FROM spans)
+                   FROM traces"""
+            ) as cur:
+                row = await cur.fetchone()
+                if row:
+                    metrics.total_traces = row[0]
+                    metrics.total_tokens = int(row[1])
+                    metrics.total_cost = float(row[2])
+                    if row[3] is not None:
+                        metrics.avg_duration_ms = round(float(row[3]), 2)
+                    metrics.error_count = row[4]
+                    metrics.total_spans = row[5]
+
+            async with conn.execute(
+                "SELECT status, COUNT(*) FROM traces GROUP BY status"
+            ) as cur:
+                async for row in cur:
+                    metrics.traces_by_status[row[0]] = row[1]
+
+            async with conn.execute(
+                """SELECT COALESCE(model, 'unknown'), SUM(cost)
+                   FROM spans
+                   WHERE span_type = 'generation' AND cost > 0
+                   GROUP BY 1"""
+            ) as cur:
+                async for row in cur:
+                    metrics.cost_by_model[row[0]] = row[1]
 
         return metrics
 
@@ -347,64 +671,124 @@ class Database:
         await self.db.execute("DELETE FROM spans")
         await self.db.execute("DELETE FROM traces")
         await self.db.commit()
+        self._invalidate()
         return count
 
     async def export_all(self) -> dict[str, Any]:
         """Export all traces and spans as a JSON-serializable dict."""
-        traces: list[dict[str, Any]] = []
-        async with self.db.execute(
-            "SELECT * FROM traces ORDER BY started_at DESC"
-        ) as cur:
-            async for row in cur:
-                t = self._row_to_trace(row)
-                spans = await self.get_spans_for_trace(t.trace_id)
-                traces.append(
-                    {
-                        "trace": t.model_dump(),
-                        "spans": [s.model_dump() for s in spans],
-                    }
-                )
-        return {"version": "1.0", "traces": traces}
+        return {"version": "1.0", "traces": [item async for item in self.iter_export()]}
+
+    async def iter_export(self, *, raw_json: bool = False) -> AsyncIterator[dict[str, Any]]:
+        """Yield ``{"trace": ..., "spans": [...]}`` per trace, newest first.
+
+        Spans are read by a single query sorted in the same trace order as
+        the traces cursor and merged in one pass (see
+        :func:`take_trace_spans`), instead of one spans query per trace.
+        With ``raw_json``, ``span_data`` is passed through
+        as stored JSON (see :func:`traceboard._json.fragment`), for callers
+        that only re-encode it with :mod:`traceboard._json`.
+        """
+        order = "ORDER BY t.started_at DESC, t.trace_id"
+        async with self._reader() as conn:
+            async with conn.execute(
+                f"SELECT {TRACE_COLUMNS} FROM traces t {order}"
+            ) as trace_rows, conn.execute(
+                f"""SELECT {SPAN_COLUMNS} FROM spans s JOIN traces t ON t.trace_id = s.trace_id
+                    {order}, s.started_at ASC"""
+            ) as span_rows:
+                buffer: deque[Sequence[Any]] = deque()
+                more = True
+                async for row in trace_rows:
+                    trace = self._trace_fields(row)
+                    rows: list[Sequence[Any]] = []
+                    while take_trace_spans(buffer, trace["trace_id"], rows) and more:
+                        chunk = await span_rows.fetchmany(EXPORT_CHUNK_SIZE)
+                        more = len(chunk) == EXPORT_CHUNK_SIZE
+                        buffer.extend(chunk)
+                    spans = [self._span_fields(span, raw_json) for span in rows]
+                    yield {"trace": trace, "spans": spans}
+
+    async def export_trace(
+        self, trace_id: str, *, raw_json: bool = False
+    ) -> dict[str, Any] | None:
+        """Export one trace and its spans, or ``None`` if it doesn't exist.
+
+        ``raw_json`` is as for :meth:`iter_export`.
+        """
+        async with self._reader() as conn:
+            async with conn.execute(
+                f"SELECT {TRACE_COLUMNS} FROM traces t WHERE t.trace_id = ?", (trace_id,)
+            ) as cursor:
+                row = await cursor.fetchone()
+            if row is None:
+                return None
+            async with conn.execute(
+                f"SELECT {SPAN_COLUMNS} FROM spans s WHERE s.trace_id = ? ORDER BY s.started_at ASC",
+                (trace_id,),
+            ) as cursor:
+                spans = [self._span_fields(span, raw_json) async for span in cursor]
+        return {"trace": self._trace_fields(row), "spans": spans}
 
     # ── Helpers ─────────────────────────────────────────────────────────
+    #
+    # Rows come from our own schema with SQLite column affinities already
+    # applied, so models are built with ``model_construct`` to skip
+    # Pydantic validation; enum columns are converted explicitly.  The
+    # ``*_fields`` dicts double as the export wire format, which needs no
+    # model at all.
+
+    @staticmethod
+    def _row_to_trace(row: Sequence[Any]) -> TraceRecord:
+        return TraceRecord.model_construct(**Database._trace_fields(row))
 
     @staticmethod
-    def _row_to_trace(row: aiosqlite.Row) -> TraceRecord:
-        metadata = row["metadata"]
+    def _trace_fields(row: Sequence[Any]) -> dict[str, Any]:
+        """Decode a :data:`TRACE_COLUMNS` row into :class:`TraceRecord` field values."""
+        (trace_id, workflow_name, group_id, started_at, ended_at,
+         status, metadata, total_tokens, total_cost) = row
         if isinstance(metadata, str):
-            metadata = json.loads(metadata)
-        return TraceRecord(
-            trace_id=row["trace_id"],
-            workflow_name=row["workflow_name"],
-            group_id=row["group_id"],
-            started_at=row["started_at"],
-            ended_at=row["ended_at"],
-            status=TraceStatus(row["status"]),
-            metadata=metadata,
-            total_tokens=row["total_tokens"],
-            total_cost=row["total_cost"],
-        )
+            metadata = _json.loads(metadata)
+        return {
+            "trace_id": trace_id,
+            "workflow_name": workflow_name,
+            "group_id": group_id,
+            "started_at": started_at,
+            "ended_at": ended_at,
+            "status": TraceStatus(status),
+            "metadata": metadata,
+            "total_tokens": total_tokens,
+            "total_cost": total_cost,
+        }
+
+    @staticmethod
+    def _row_to_span(row: Sequence[Any]) -> SpanRecord:
+        return SpanRecord.model_construct(**Database._span_fields(row))
 
     @staticmethod
-    def _row_to_span(row: aiosqlite.Row) -> SpanRecord:
-        span_data = row["span_data"]
-        if isinstance(span_data, str):
-            span_data = json.loads(span_data)
-        error = row["error"]
+    def _span_fields(row: Sequence[Any], raw_json: bool = False) -> dict[str, Any]:
+        """Decode a :data:`SPAN_COLUMNS` row into :class:`SpanRecord` field values.
+
+        With ``raw_json``, ``span_data`` stays encoded as a
+        :func:`traceboard._json.fragment` instead of being parsed.
+        """
+        (span_id, trace_id, parent_id, span_type, name,
+         started_at, ended_at, span_data, error, cost) = row
+        if isinstance(span_data, (str, bytes)):
+            span_data = _json.fragment(span_data) if raw_json else _json.unpack(span_data)
         if isinstance(error, str):
-            error = json.loads(error)
-        return SpanRecord(
-            span_id=row["span_id"],
-            trace_id=row["trace_id"],
-            parent_id=row["parent_id"],
-            span_type=row["span_type"],
-            name=row["name"],
-            started_at=row["started_at"],
-            ended_at=row["ended_at"],
-            span_data=span_data,
-            error=error,
-            cost=row["cost"],
-        )
+            error = _json.loads(error)
+        return {
+            "span_id": span_id,
+            "trace_id": trace_id,
+            "parent_id": parent_id,
+            "span_type": SpanType(span_type),
+            "name": name,
+            "started_at": started_at,
+            "ended_at": ended_at,
+            "span_data": span_data,
+            "error": error,
+            "cost": cost,
+        }
 
 
 # ── Synchronous helper for SDK (non-async context) ────────────────────────
@@ -416,17 +800,32 @@ class SyncDatabase:
     def __init__(self, db_path: str = "./traceboard.db"):
         self.db_path = db_path
         self._conn: sqlite3.Connection | None = None
+        self._in_transaction = False
 
     def connect(self) -> None:
         Path(self.db_path).parent.mkdir(parents=True, exist_ok=True)
-        self._conn = sqlite3.connect(self.db_path, check_same_thread=False)
-        self._conn.execute("PRAGMA journal_mode=WAL")
-        self._conn.execute("PRAGMA foreign_keys=ON")
+        self._conn = sqlite3.connect(
+            self.db_path,
+            check_same_thread=False,
+            cached_statements=_SYNC_CACHED_STATEMENTS,
+        )
+        for pragma in CONNECTION_PRAGMAS:
+            self._conn.execute(pragma)
+        self._conn.create_function("span_json", 1, _json.unpack_text, deterministic=True)
         self._conn.executescript(SCHEMA_SQL)
         self._conn.commit()
 
+        # IMMEDIATE so a concurrent dashboard can't migrate at the same time
+        self._conn.execute("BEGIN IMMEDIATE")
+        if not self._conn.execute(HAS_SPAN_MODEL_SQL).fetchone():
+            for sql in SPAN_MODEL_MIGRATION:
+                self._conn.execute(sql)
+        self._conn.commit()
+
     def close(self) -> None:
         if self._conn:
+            # Refresh planner statistics that changed while tracing
+            self._conn.execute("PRAGMA optimize")
             self._conn.close()
             self._conn = None
 
@@ -436,53 +835,57 @@ class SyncDatabase:
             raise RuntimeError("Database not connected.")
         return self._conn
 
+    @contextmanager
+    def transaction(self) -> Iterator[None]:
+        """Group several writes into a single commit.
+
+        Writes issued inside the block skip their own commit; the whole
+        block is committed once on exit, or rolled back on error.
+        """
+        if self._in_transaction:
+            yield
+            return
+        self._in_transaction = True
+        try:
+            yield
+            self.conn.commit()
+        except BaseException:
+            self.conn.rollback()
+            raise
+        finally:
+            self._in_transaction = False
+
+    def _commit(self) -> None:
+        if not self._in_transaction:
+            self.conn.commit()
+
     def insert_trace(self, trace: TraceRecord) -> None:
-        self.conn.execute(
-            """INSERT OR REPLACE INTO traces
-               (trace_id, workflow_name, group_id, started_at, ended_at,
-                status, metadata, total_tokens, total_cost)
-               VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)""",
-            (
-                trace.trace_id,
-                trace.workflow_name,
-                trace.group_id,
-                trace.started_at,
-                trace.ended_at,
-                trace.status.value,
-                json.dumps(trace.metadata),
-                trace.total_tokens,
-                trace.total_cost,
-            ),
-        )
-        self.conn.commit()
+        self.conn.execute(INSERT_TRACE_SQL, _trace_row(trace))
+        self._commit()
 
     def update_trace_end(self, trace_id: str, ended_at: float, status: str, total_tokens: int, total_cost: float) -> None:
         self.conn.execute(
-            """UPDATE traces SET ended_at=?, status=?, total_tokens=?, total_cost=?
-               WHERE trace_id=?""",
+            UPDATE_TRACE_END_SQL,
             (ended_at, status, total_tokens, total_cost, trace_id),
         )
-        self.conn.commit()
+        self._commit()
 
     def insert_span(self, span: SpanRecord) -> None:
-        self.conn.execute(
-            """INSERT OR REPLACE INTO spans
-               (span_id, trace_id, parent_id, span_type, name,
-                started_at, ended_at, span_data, error, cost)
-               VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)""",
-            (
-                span.span_id, span.trace_id, span.parent_id,
-                span.span_type.value, span.name, span.started_at,
-                span.ended_at, json.dumps(span.span_data),
-                json.dumps(span.error) if span.error else None, span.cost,
-            ),
-        )
-        self.conn.commit()
+        self.conn.execute(INSERT_SPAN_SQL, _span_row(span))
+        self._commit()
+
+    def insert_spans(self, spans: list[SpanRecord]) -> None:
+        self.conn.executemany(INSERT_SPAN_SQL, [_span_row(s) for s in spans])
+        self._commit()
 
     def update_span_end(self, span_id: str, ended_at: float, span_data: dict, error: dict | None, cost: float) -> None:
         self.conn.execute(
-            """UPDATE spans SET ended_at=?, span_data=?, error=?, cost=?
-               WHERE span_id=?""",
-            (ended_at, json.dumps(span_data), json.dumps(error) if error else None, cost, span_id),
+            UPDATE_SPAN_END_SQL,
+            _span_end_row(span_id, ended_at, span_data, error, cost),
         )
-        self.conn.commit()
+        self._commit()
+
+    def update_span_ends(self, ends: list[dict[str, Any]]) -> None:
+        """Apply several :meth:`update_span_end` calls given as keyword dicts."""
+        self.conn.executemany(UPDATE_SPAN_END_SQL, [_span_end_row(**end) for end in ends])
+        self._commit()
@@ -62,6 +62,8 @@ class TraceListResponse(BaseModel):
     total: int
     page: int
     page_size: int
+    next_cursor: float | None = None
+    next_cursor_id: str | None = None
 
 
 # ── Span Models ────────────────────────────────────────────────────────────
@@ -4,9 +4,12 @@ from __future__ import annotations
 
 import asyncio
 import logging
+from collections.abc import AsyncIterator
 
 from fastapi import APIRouter, Request, WebSocket, WebSocketDisconnect
+from fastapi.responses import StreamingResponse
 
+from traceboard import _json
 from traceboard.server.models import MetricsResponse
 
 logger = logging.getLogger("traceboard")
@@ -27,9 +30,19 @@ async def get_metrics(request: Request):
 
 @router.get("/export")
 async def export_all(request: Request):
-    """Export all traces and spans as JSON."""
+    """Export all traces and spans as JSON, streamed one trace at a time."""
     db = _get_db(request)
-    return await db.export_all()
+    return StreamingResponse(_stream_export(db), media_type="application/json")
+
+
+async def _stream_export(db) -> AsyncIterator[bytes]:
+    """Encode :meth:`Database.export_all`'s document without building it whole."""
+    yield b'{"version":"1.0","traces":['
+    separator = b""
+    async for item in db.iter_export(raw_json=True):
+        yield separator + _json.dumpb(item)
+        separator = b","
+    yield b"]}"
 
 
 # ── WebSocket for live updates ─────────────────────────────────────────
@@ -39,72 +52,82 @@ class ConnectionManager:
     """Manages active WebSocket connections for live updates."""
 
     def __init__(self):
-        self.active_connections: list[WebSocket] = []
+        self.active_connections: set[WebSocket] = set()
+        # Set when a client joins, so the next poll sends it a snapshot
+        self.needs_snapshot = False
 
     async def connect(self, websocket: WebSocket):
         await websocket.accept()
-        self.active_connections.append(websocket)
+        self.active_connections.add(websocket)
+        self.needs_snapshot = True
 
     def disconnect(self, websocket: WebSocket):
-        if websocket in self.active_connections:
-            self.active_connections.remove(websocket)
+        self.active_connections.discard(websocket)
 
     async def broadcast(self, message: dict):
-        """Send a message to all connected clients."""
-        dead: list[WebSocket] = []
-        for connection in self.active_connections:
-            try:
-                await connection.send_json(message)
-            except Exception:
-                dead.append(connection)
-        for ws in dead:
-            if ws in self.active_connections:
-                self.active_connections.remove(ws)
+        """Send a message to all connected clients, encoding it once.
+
+        Sends run concurrently, so one slow client doesn't hold up the rest.
+        """
+        text = _json.dumps(message)
+        connections = list(self.active_connections)
+        results = await asyncio.gather(
+            *(connection.send_text(text) for connection in connections),
+            return_exceptions=True,
+        )
+        for connection, result in zip(connections, results):
+            if isinstance(result, Exception):
+                self.active_connections.discard(connection)
 
     @property
     def has_connections(self) -> bool:
-        return len(self.active_connections) > 0
+        return bool(self.active_connections)
 
 
 manager = ConnectionManager()
 
 
+async def push_updates(db, interval: float = 1.0, debounce: float = 0.1) -> None:
+    """Broadcast metrics to every client whenever the database changes.
+
+    Runs once for the lifetime of the app, so database load does not grow
+    with the number of open dashboards.  Writes through ``db`` wake it
+    immediately (after ``debounce``, so a burst becomes one update);
+    commits from SDK processes are noticed within ``interval`` through
+    :meth:`Database.change_token`.  Metrics are only queried when
+    something changed and a client is listening.
+    """
+    last_token: tuple[int, int] | None = None
+    while True:
+        if await db.wait_for_write(interval):
+            await asyncio.sleep(debounce)
+        if not manager.has_connections:
+            continue
+        try:
+            token = await db.change_token()
+            if token == last_token and not manager.needs_snapshot:
+                continue
+            metrics = await db.get_metrics()
+        except Exception:
+            logger.debug("WebSocket push: failed to read metrics")
+            continue
+
+        last_token = token
+        manager.needs_snapshot = False
+        await manager.broadcast({
+            "type": "update",
+            "metrics": metrics.model_dump(),
+        })
+
+
 @router.websocket("/ws/live")
 async def websocket_live(websocket: WebSocket):
-    """WebSocket endpoint for real-time trace/span events."""
-    await manager.connect(websocket)
-    db = websocket.app.state.db
+    """WebSocket endpoint for real-time trace/span events.
 
-    async def push_updates():
-        """Background task: poll DB and push updates on change."""
-        last_trace_count = -1
-        last_span_count = -1
-        try:
-            while True:
-                await asyncio.sleep(1)
-                try:
-                    metrics = await db.get_metrics()
-                except Exception:
-                    logger.debug("WebSocket push: failed to read metrics")
-                    continue
-
-                tc = metrics.total_traces
-                sc = metrics.total_spans
-
-                if tc != last_trace_count or sc != last_span_count:
-                    last_trace_count = tc
-                    last_span_count = sc
-                    try:
-                        await websocket.send_json({
-                            "type": "update",
-                            "metrics": metrics.model_dump(),
-                        })
-                    except Exception:
-                        break
-        except asyncio.CancelledError:
-            pass
-
-    push_task = asyncio.create_task(push_updates())
+    Metric updates are pushed by :func:`push_updates`; this handler only
+    answers pings.
+    """
+    await manager.connect(websocket)
     try:
         while True:
             data = await websocket.receive_text()
@@ -115,9 +138,4 @@ async def websocket_live(websocket: WebSocket):
     except Exception:
         logger.debug("WebSocket connection error")
     finally:
-        push_task.cancel()
-        try:
-            await push_task
-        except asyncio.CancelledError:
-            pass
         manager.disconnect(websocket)
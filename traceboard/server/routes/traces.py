@@ -2,8 +2,12 @@
 
 from __future__ import annotations
 
+import asyncio
+
 from fastapi import APIRouter, HTTPException, Request, Query
+from fastapi.responses import Response
 
+from traceboard import _json
 from traceboard.server.models import (
     TraceDetailResponse,
     TraceListResponse,
@@ -23,24 +27,38 @@ async def list_traces(
     page_size: int = Query(50, ge=1, le=200, description="Items per page"),
     status: str | None = Query(None, description="Filter by status"),
     workflow_name: str | None = Query(None, description="Filter by workflow name"),
+    after: float | None = Query(
+        None, description="Cursor: return traces started before this timestamp"
+    ),
+    after_id: str | None = Query(
+        None, description="Cursor tie-breaker: trace_id of the previous page's last trace"
+    ),
 ):
     """List all traces with pagination and optional filters."""
     db = _get_db(request)
     items, total = await db.list_traces(
         page=page, page_size=page_size, status=status, workflow_name=workflow_name,
+        after=after, after_id=after_id,
+    )
+    last = items[-1] if len(items) == page_size else None
+    return TraceListResponse(
+        traces=items, total=total, page=page, page_size=page_size,
+        next_cursor=last.started_at if last else None,
+        next_cursor_id=last.trace_id if last else None,
     )
-    return TraceListResponse(traces=items, total=total, page=page, page_size=page_size)
 
 
 @router.get("/traces/{trace_id}")
 async def get_trace_detail(request: Request, trace_id: str):
     """Get full trace details with all spans and span tree."""
     db = _get_db(request)
-    trace = await db.get_trace(trace_id)
+    # Independent reads — each borrows its own pooled connection
+    trace, (spans, tree) = await asyncio.gather(
+        db.get_trace(trace_id),
+        db.get_spans_and_tree(trace_id),
+    )
     if trace is None:
         raise HTTPException(status_code=404, detail=f"Trace {trace_id} not found")
-    spans = await db.get_spans_for_trace(trace_id)
-    tree = await db.build_span_tree(trace_id)
     return TraceDetailResponse(trace=trace, spans=spans, tree=tree)
 
 
@@ -56,8 +74,8 @@ async def delete_all_traces(request: Request):
 async def export_trace(request: Request, trace_id: str):
     """Export a single trace with all its spans."""
     db = _get_db(request)
-    trace = await db.get_trace(trace_id)
-    if trace is None:
+    data = await db.export_trace(trace_id, raw_json=True)
+    if data is None:
         raise HTTPException(status_code=404, detail=f"Trace {trace_id} not found")
-    spans = await db.get_spans_for_trace(trace_id)
-    return {"trace": trace.model_dump(), "spans": [s.model_dump() for s in spans]}
+    # Already plain dicts; skip FastAPI's jsonable_encoder pass
+    return Response(_json.dumpb(data), media_type="application/json")